@@ -0,0 +1,227 @@
+from __future__ import print_function
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import timeit
+from datetime import date, timedelta
+
+from yearmonth import YearMonth
+import recurrence
+import recurrencereference
+
+
+# Usage:
+#   python benchmark.py --output results.json
+#   python benchmark.py --baseline results.json --threshold 0.1
+#
+# Every benchmark runs a fixed workload; the reported figure is the best of
+# several repeats, in seconds per call of the benchmarked function.
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+MONTHS_BASED_BRANCHES = (
+	('day_of_period_positive', 7, recurrence.DAY_OF_PERIOD),
+	('day_of_period_negative', -1, recurrence.DAY_OF_PERIOD),
+	('weekday_positive', 2, recurrence.TUE),
+	('weekday_negative', -1, recurrence.FRI),
+)
+
+
+def _recurrence_benchmarks(label, rc):
+	numbers = list(range(-50, 50))
+	dates = [date(2012, 1, 1) + timedelta(days=offset) for offset in range(0, 1000, 10)]
+	day_ordinals = [candidate.toordinal() for candidate in dates]
+
+	def get_occurrence():
+		for number in numbers:
+			rc.get_occurrence(number)
+
+	def is_occurrence():
+		for candidate in dates:
+			rc.is_occurrence(candidate)
+
+	def get_occurrence_after():
+		for candidate in dates:
+			rc.get_occurrence_after(candidate)
+
+	def get_occurrence_ordinal():
+		for number in numbers:
+			rc.get_occurrence_ordinal(number)
+
+	def get_occurrence_after_ordinal():
+		for day_ordinal in day_ordinals:
+			rc.get_occurrence_after_ordinal(day_ordinal)
+
+	def generate():
+		for _ in itertools.islice(rc.generate(), 100):
+			pass
+
+	def generate_after():
+		for _ in itertools.islice(rc.generate_after(dates[0]), 100):
+			pass
+
+	for function in (get_occurrence, is_occurrence, get_occurrence_after, get_occurrence_ordinal,
+			get_occurrence_after_ordinal, generate, generate_after):
+		yield 'micro.%s.%s' % (label, function.__name__), function, 100
+
+
+def _evaluator_benchmarks():
+	# Occurrence computation for one period, through the evaluator picked
+	# for the recurrence and through the generic path handling every case
+	month_ordinals = list(range(24000, 24100))
+	for label, ordinal, day in MONTHS_BASED_BRANCHES:
+		rc = recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, ordinal, day)
+
+		def specialized(rc=rc):
+			evaluator = rc._evaluator
+			for month_ordinal in month_ordinals:
+				evaluator(rc, month_ordinal)
+
+		def generic(rc=rc):
+			for month_ordinal in month_ordinals:
+				recurrencereference.day_for_month_ordinal(rc, month_ordinal)
+
+		for function in (specialized, generic):
+			yield 'micro.evaluator.%s.%s' % (label, function.__name__), function, 100
+
+
+def _yearmonth_benchmarks():
+	yms = [YearMonth(2000 + offset // 12, offset % 12 + 1) for offset in range(100)]
+	strings = [str(ym) for ym in yms]
+
+	def add():
+		for ym in yms:
+			ym + 7
+
+	def subtract():
+		for ym in yms:
+			ym - yms[0]
+
+	def compare():
+		for ym in yms:
+			ym <= yms[50]
+
+	def from_string():
+		for string in strings:
+			YearMonth.from_string(string)
+
+	def from_ordinal():
+		for ordinal in range(24000, 24100):
+			YearMonth.from_ordinal(ordinal)
+
+	def get_last_day():
+		for ym in yms:
+			ym.get_last_day()
+
+	for function in (add, subtract, compare, from_string, from_ordinal, get_last_day):
+		yield 'micro.yearmonth.%s' % function.__name__, function, 100
+
+
+def _macro_benchmarks():
+	recurrences = [recurrence.DaysBasedRecurrence(date(2012, 1, 1) + timedelta(days=offset), 1 + offset % 30)
+			for offset in range(50)]
+	recurrences += [recurrence.MonthsBasedRecurrence(YearMonth(2012, 1 + offset % 12), 1 + offset % 3, ordinal, day)
+			for offset, (_, ordinal, day) in enumerate(MONTHS_BASED_BRANCHES * 13)]
+	start, end = date(2012, 1, 1), date(2022, 1, 1)
+
+	def generate_after_ten_years():
+		for rc in recurrences:
+			for _ in rc.generate_after(start, before=end):
+				pass
+
+	def occurrences_between_ten_years():
+		for rc in recurrences:
+			for _ in rc.occurrences_between(start, end):
+				pass
+
+	def merge_after_one_year():
+		for _ in recurrence.merge_after(recurrences, start, before=date(2013, 1, 1)):
+			pass
+
+	for function in (generate_after_ten_years, occurrences_between_ten_years, merge_after_one_year):
+		yield 'macro.%s' % function.__name__, function, 1
+
+
+def get_benchmarks():
+	benchmarks = list(_recurrence_benchmarks('days_based', recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3)))
+	for label, ordinal, day in MONTHS_BASED_BRANCHES:
+		rc = recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, ordinal, day)
+		benchmarks.extend(_recurrence_benchmarks('months_based.' + label, rc))
+		# The workloads touch fewer periods than the cache holds, so every
+		# repeat after the first runs warm
+		rc = recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, ordinal, day, cache_size=256)
+		benchmarks.extend(_recurrence_benchmarks('months_based_cached.' + label, rc))
+	benchmarks.extend(_evaluator_benchmarks())
+	benchmarks.extend(_yearmonth_benchmarks())
+	benchmarks.extend(_macro_benchmarks())
+	return benchmarks
+
+
+def run(benchmarks, repeat=DEFAULT_REPEAT, scale=1.0):
+	results = {}
+	for name, function, number in benchmarks:
+		number = max(1, int(number * scale))
+		timings = timeit.Timer(function).repeat(repeat=repeat, number=number)
+		results[name] = {
+			'seconds': min(timings) / number,
+			'number': number,
+			'repeat': repeat,
+		}
+	return {
+		'python': platform.python_version(),
+		'implementation': platform.python_implementation(),
+		'results': results,
+	}
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+	# Returns (name, baseline seconds, current seconds, ratio) for every
+	# benchmark that got slower than the baseline by more than threshold
+	regressions = []
+	for name, result in sorted(current['results'].items()):
+		if name not in baseline['results']:
+			continue
+		previous = baseline['results'][name]['seconds']
+		ratio = result['seconds'] / previous if previous else float('inf')
+		if ratio > 1 + threshold:
+			regressions.append((name, previous, result['seconds'], ratio))
+	return regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Benchmark the recurrence and yearmonth hot paths.')
+	parser.add_argument('--output', help='write results as JSON to this file')
+	parser.add_argument('--baseline', help='compare against results previously saved with --output')
+	parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+			help='relative slowdown reported as a regression (default: %(default)s)')
+	parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this string')
+	parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+	parser.add_argument('--quick', action='store_true', help='run a tenth of the iterations')
+	args = parser.parse_args(argv)
+
+	benchmarks = [benchmark for benchmark in get_benchmarks() if args.filter in benchmark[0]]
+	current = run(benchmarks, repeat=args.repeat, scale=0.1 if args.quick else 1.0)
+	for name, result in sorted(current['results'].items()):
+		print('%-60s %12.3f us' % (name, result['seconds'] * 1e6))
+
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(current, f, indent=1, sort_keys=True)
+
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+		regressions = compare(current, baseline, args.threshold)
+		for name, previous, seconds, ratio in regressions:
+			print('REGRESSION %s: %.3f us -> %.3f us (x%.2f)' % (name, previous * 1e6, seconds * 1e6, ratio))
+		if regressions:
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
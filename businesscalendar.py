@@ -0,0 +1,187 @@
+import bisect
+import datetime
+
+import recurrence
+import yearmonth
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+# Business day conventions: roll a non-business day to the next business
+# day, to the previous one, or to the next one unless that falls in another
+# month, in which case to the previous one
+FOLLOWING = 'FOLLOWING'
+PRECEDING = 'PRECEDING'
+MODIFIED_FOLLOWING = 'MODIFIED_FOLLOWING'
+
+_NUMPY_ROLLS = {
+	FOLLOWING: 'following',
+	PRECEDING: 'preceding',
+	MODIFIED_FOLLOWING: 'modifiedfollowing',
+}
+
+
+class BusinessCalendar(object):
+	# Weekend days plus a sorted list of holiday day ordinals. For every
+	# holiday the nearest business days on either side are precomputed, so an
+	# adjustment is a weekday table lookup and a single bisect whatever the
+	# length of the run of closed days.
+	
+	def __init__(self, holidays=(), weekend=(recurrence.SAT, recurrence.SUN)):
+		self.weekend_mask = tuple(weekday in weekend for weekday in range(7))
+		if all(self.weekend_mask):
+			raise ValueError('Invalid weekend, there would be no business days: ' + repr(weekend))
+		
+		# Days to the nearest business weekday forwards and backwards, by weekday
+		self._forward = tuple(self._weekday_distance(weekday, +1) for weekday in range(7))
+		self._backward = tuple(self._weekday_distance(weekday, -1) for weekday in range(7))
+		
+		# Holidays falling on a weekend change nothing and are left out
+		ordinals = set(holiday.toordinal() if isinstance(holiday, datetime.date) else int(holiday) for holiday in holidays)
+		self.holidays = sorted(ordinal for ordinal in ordinals if not self.weekend_mask[(ordinal + 6) % 7])
+		
+		self._next_business_day = [0] * len(self.holidays)
+		for index in range(len(self.holidays) - 1, -1, -1):
+			candidate = self._business_weekday(self.holidays[index] + 1, +1)
+			if index + 1 < len(self.holidays) and self.holidays[index + 1] == candidate:
+				candidate = self._next_business_day[index + 1]
+			self._next_business_day[index] = candidate
+		
+		self._previous_business_day = [0] * len(self.holidays)
+		for index in range(len(self.holidays)):
+			candidate = self._business_weekday(self.holidays[index] - 1, -1)
+			if index > 0 and self.holidays[index - 1] == candidate:
+				candidate = self._previous_business_day[index - 1]
+			self._previous_business_day[index] = candidate
+		
+		self._numpy_calendar = None
+		if numpy is not None:
+			self._numpy_calendar = numpy.busdaycalendar(
+					weekmask=[not closed for closed in self.weekend_mask],
+					holidays=(numpy.array(self.holidays, dtype=numpy.int64) - recurrence._EPOCH_DAY_ORDINAL).astype('datetime64[D]')
+				)
+	
+	def is_business_day(self, date):
+		return self.is_business_day_ordinal(date.toordinal())
+	
+	def is_business_day_ordinal(self, day_ordinal):
+		return not self.weekend_mask[(day_ordinal + 6) % 7] and self._holiday_index(day_ordinal) is None
+	
+	def adjust(self, date, rule=FOLLOWING):
+		day_ordinal = date.toordinal()
+		adjusted = self.adjust_ordinal(day_ordinal, rule)
+		return date if adjusted == day_ordinal else datetime.date.fromordinal(adjusted)
+	
+	def adjust_ordinal(self, day_ordinal, rule=FOLLOWING):
+		if rule == FOLLOWING:
+			return self._following(day_ordinal)
+		elif rule == PRECEDING:
+			return self._preceding(day_ordinal)
+		elif rule == MODIFIED_FOLLOWING:
+			adjusted = self._following(day_ordinal)
+			if adjusted != day_ordinal and (yearmonth.month_ordinal_for_day(adjusted)
+					!= yearmonth.month_ordinal_for_day(day_ordinal)):
+				adjusted = self._preceding(day_ordinal)
+			return adjusted
+		else:
+			raise ValueError('Invalid rule: ' + repr(rule))
+	
+	def adjust_array(self, dates, rule=FOLLOWING):
+		# Adjusts an array of dates at once, as datetime64[D]
+		if rule not in _NUMPY_ROLLS:
+			raise ValueError('Invalid rule: ' + repr(rule))
+		dates = recurrence._as_date_array(dates)
+		return numpy.busday_offset(dates, 0, roll=_NUMPY_ROLLS[rule], busdaycal=self._numpy_calendar)
+	
+	def _following(self, day_ordinal):
+		day_ordinal = self._business_weekday(day_ordinal, +1)
+		index = self._holiday_index(day_ordinal)
+		return day_ordinal if index is None else self._next_business_day[index]
+	
+	def _preceding(self, day_ordinal):
+		day_ordinal = self._business_weekday(day_ordinal, -1)
+		index = self._holiday_index(day_ordinal)
+		return day_ordinal if index is None else self._previous_business_day[index]
+	
+	def _business_weekday(self, day_ordinal, direction):
+		weekday = (day_ordinal + 6) % 7
+		if direction > 0:
+			return day_ordinal + self._forward[weekday]
+		else:
+			return day_ordinal - self._backward[weekday]
+	
+	def _weekday_distance(self, weekday, direction):
+		distance = 0
+		while self.weekend_mask[(weekday + direction * distance) % 7]:
+			distance += 1
+		return distance
+	
+	def _holiday_index(self, day_ordinal):
+		index = bisect.bisect_left(self.holidays, day_ordinal)
+		if index < len(self.holidays) and self.holidays[index] == day_ordinal:
+			return index
+		return None
+
+
+class AdjustedRecurrence(recurrence.Recurrence):
+	# The occurrences of another recurrence moved to business days. Every
+	# adjustment rule keeps occurrences in order, so occurrence numbers are
+	# those of the wrapped recurrence and date lookups start from its own,
+	# correcting by a step when an adjustment crossed the date. Occurrences
+	# adjusted onto the same day stay distinct occurrences.
+	
+	def __init__(self, recurrence, calendar, rule=FOLLOWING):
+		if rule not in _NUMPY_ROLLS:
+			raise ValueError('Invalid rule: ' + repr(rule))
+		
+		self.recurrence = recurrence
+		self.calendar = calendar
+		self.rule = rule
+	
+	def get_occurrence(self, number):
+		return self.calendar.adjust(self.recurrence.get_occurrence(number), self.rule)
+	
+	def get_occurrences(self, numbers):
+		return self.calendar.adjust_array(self.recurrence.get_occurrences(numbers), self.rule)
+	
+	def is_occurrence(self, candidate):
+		return self.get_occurrence(self._get_number_after(candidate - recurrence._ONE_DAY)) == candidate
+	
+	def get_occurrence_number(self, occurrence):
+		number = self._get_number_after(occurrence - recurrence._ONE_DAY)
+		if self.get_occurrence(number) == occurrence:
+			return number
+		else:
+			raise ValueError('The date %r is not a valid occurrence' % occurrence)
+	
+	def get_occurrence_after(self, date):
+		return self.get_occurrence(self._get_number_after(date))
+	
+	def _get_number_after(self, date):
+		number = self.recurrence._get_number_after(date)
+		while self.get_occurrence(number - 1) > date:
+			number -= 1
+		while self.get_occurrence(number) <= date:
+			number += 1
+		return number
+	
+	def _get_number_before(self, date):
+		number = self.recurrence._get_number_before(date)
+		while self.get_occurrence(number + 1) < date:
+			number += 1
+		while self.get_occurrence(number) >= date:
+			number -= 1
+		return number
+	
+	def __eq__(self, other):
+		return (isinstance(other, AdjustedRecurrence)
+			and self.recurrence == other.recurrence
+			and self.calendar is other.calendar
+			and self.rule == other.rule
+		)
+	
+	def __hash__(self):
+		return hash(self.recurrence) ^ id(self.calendar) ^ hash(self.rule)
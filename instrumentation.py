@@ -0,0 +1,186 @@
+import collections
+import functools
+import inspect
+import threading
+import time
+
+import recurrence
+
+
+# Opt-in profiling of the recurrence classes. enable() swaps the instrumented
+# methods for timing wrappers and disable() puts the originals back, so
+# nothing is paid while instrumentation is off.
+#
+# Statistics are kept per class and per instance tag (see tag()), and can be
+# read with snapshot() or received call by call through a callback.
+
+INSTRUMENTED_METHODS = (
+	'get_occurrence',
+	'get_occurrences',
+	'get_occurrence_after',
+	'is_occurrence',
+	'_date_for_period',
+	'generate',
+	'generate_after',
+	'occurrences_between',
+)
+
+_CLASSES = (recurrence.Recurrence, recurrence.DaysBasedRecurrence, recurrence.MonthsBasedRecurrence)
+
+_TAG_ATTRIBUTE = '_instrumentation_tag'
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+_lock = threading.Lock()
+_originals = {}
+_callback = None
+_by_class = {}
+_by_tag = {}
+
+
+class _MethodStats(object):
+
+	def __init__(self):
+		self.calls = 0
+		self.seconds = 0.0
+		self.yielded = 0
+		self.arguments = collections.Counter()
+
+	def as_dict(self):
+		return {
+			'calls': self.calls,
+			'seconds': self.seconds,
+			'yielded': self.yielded,
+			'arguments': dict(self.arguments),
+		}
+
+
+def enable(methods=INSTRUMENTED_METHODS, callback=None):
+	global _callback
+	with _lock:
+		_callback = callback
+		for cls in _CLASSES:
+			for name in methods:
+				if name in cls.__dict__ and (cls, name) not in _originals:
+					original = cls.__dict__[name]
+					_originals[(cls, name)] = original
+					setattr(cls, name, _wrap(name, original))
+
+
+def disable():
+	global _callback
+	with _lock:
+		for (cls, name), original in _originals.items():
+			setattr(cls, name, original)
+		_originals.clear()
+		_callback = None
+
+
+def is_enabled():
+	return bool(_originals)
+
+
+def tag(rc, label):
+	setattr(rc, _TAG_ATTRIBUTE, label)
+
+
+def get_tag(rc):
+	return getattr(rc, _TAG_ATTRIBUTE, None)
+
+
+def snapshot():
+	with _lock:
+		return {
+			'classes': _export(_by_class),
+			'tags': _export(_by_tag),
+		}
+
+
+def reset():
+	with _lock:
+		_by_class.clear()
+		_by_tag.clear()
+
+
+def _export(groups):
+	return dict((key, dict((name, stats.as_dict()) for name, stats in methods.items()))
+			for key, methods in groups.items())
+
+
+def _describe(argument):
+	# Argument "shape": the type name, plus a power-of-two size bucket for
+	# sized arguments such as arrays of occurrence numbers
+	name = type(argument).__name__
+	try:
+		size = len(argument)
+	except TypeError:
+		return name
+	bucket = 1
+	while bucket < size:
+		bucket *= 2
+	return '%s[<=%d]' % (name, bucket)
+
+
+def _record(rc, name, seconds, shape, yielded=0):
+	cls_name = type(rc).__name__
+	label = get_tag(rc)
+	with _lock:
+		groups = [_by_class.setdefault(cls_name, {})]
+		if label is not None:
+			groups.append(_by_tag.setdefault(label, {}))
+		for methods in groups:
+			stats = methods.get(name)
+			if stats is None:
+				stats = methods[name] = _MethodStats()
+			stats.calls += 1
+			stats.seconds += seconds
+			stats.yielded += yielded
+			stats.arguments[shape] += 1
+		callback = _callback
+	if callback is not None:
+		callback({
+			'class': cls_name,
+			'tag': label,
+			'method': name,
+			'seconds': seconds,
+			'arguments': shape,
+			'yielded': yielded,
+		})
+
+
+def _wrap(name, original):
+	if inspect.isgeneratorfunction(original):
+		@functools.wraps(original)
+		def wrapper(self, *args, **kwargs):
+			return _timed_generator(self, name, original(self, *args, **kwargs), _shape(args))
+	else:
+		@functools.wraps(original)
+		def wrapper(self, *args, **kwargs):
+			start = _clock()
+			try:
+				return original(self, *args, **kwargs)
+			finally:
+				_record(self, name, _clock() - start, _shape(args))
+	return wrapper
+
+
+def _timed_generator(rc, name, generator, shape):
+	seconds = 0.0
+	yielded = 0
+	try:
+		while True:
+			start = _clock()
+			try:
+				value = next(generator)
+			except StopIteration:
+				seconds += _clock() - start
+				return
+			seconds += _clock() - start
+			yielded += 1
+			yield value
+	finally:
+		_record(rc, name, seconds, shape, yielded)
+
+
+def _shape(args):
+	return ', '.join(_describe(argument) for argument in args)
@@ -0,0 +1,96 @@
+import datetime
+import numpy
+import recurrence
+
+
+class OccurrenceBitmap(object):
+	# One bit per day of the half-open range [start, end), packed eight days
+	# to a byte with the earliest day in the most significant bit
+	
+	def __init__(self, start, end, packed=None):
+		if end < start:
+			raise ValueError('Invalid range: %r to %r' % (start, end))
+		
+		self.start = start
+		self.end = end
+		self.size = (end - start).days
+		if packed is None:
+			packed = numpy.zeros((self.size + 7) // 8, dtype=numpy.uint8)
+		elif len(packed) != (self.size + 7) // 8:
+			raise ValueError('Invalid bitmap length: ' + repr(len(packed)))
+		self._packed = packed
+	
+	@staticmethod
+	def from_recurrence(rc, start, end):
+		bitmap = OccurrenceBitmap(start, end)
+		flags = numpy.zeros(bitmap.size, dtype=bool)
+		if isinstance(rc, recurrence.DaysBasedRecurrence):
+			first, stop = rc._get_numbers_between(start, end)
+			if first < stop:
+				offset = (rc.get_occurrence(first) - start).days
+				flags[offset::rc.period] = True
+		elif isinstance(rc, recurrence.MonthsBasedRecurrence):
+			offsets = (rc.get_occurrences_between(start, end) - numpy.datetime64(start, 'D')).astype(numpy.int64)
+			# Never let an out of range offset fail or wrap around to the wrong day
+			flags[offsets[(offsets >= 0) & (offsets < bitmap.size)]] = True
+		else:
+			for occurrence in rc.occurrences_between(start, end):
+				flags[(occurrence - start).days] = True
+		bitmap._packed = numpy.packbits(flags)
+		return bitmap
+	
+	def union(self, *others):
+		packed = self._packed.copy()
+		for other in others:
+			packed |= self._check_compatible(other)._packed
+		return OccurrenceBitmap(self.start, self.end, packed)
+	
+	def intersection(self, *others):
+		packed = self._packed.copy()
+		for other in others:
+			packed &= self._check_compatible(other)._packed
+		return OccurrenceBitmap(self.start, self.end, packed)
+	
+	def difference(self, *others):
+		packed = self._packed.copy()
+		for other in others:
+			packed &= ~self._check_compatible(other)._packed
+		return OccurrenceBitmap(self.start, self.end, packed)
+	
+	def __or__(self, other):
+		return self.union(other)
+	
+	def __and__(self, other):
+		return self.intersection(other)
+	
+	def __sub__(self, other):
+		return self.difference(other)
+	
+	def count(self):
+		return int(numpy.unpackbits(self._packed).sum())
+	
+	def to_datetime64(self):
+		offsets = numpy.flatnonzero(numpy.unpackbits(self._packed)[:self.size])
+		return numpy.datetime64(self.start, 'D') + offsets.astype('timedelta64[D]')
+	
+	def to_dates(self):
+		return [self.start + datetime.timedelta(days=int(offset))
+				for offset in numpy.flatnonzero(numpy.unpackbits(self._packed)[:self.size])]
+	
+	def tobytes(self):
+		return self._packed.tobytes()
+	
+	def __contains__(self, date):
+		if not self.start <= date < self.end:
+			return False
+		offset = (date - self.start).days
+		return bool(self._packed[offset >> 3] & (0x80 >> (offset & 7)))
+	
+	def _check_compatible(self, other):
+		if self.start != other.start or self.end != other.end:
+			raise ValueError('Bitmaps cover different ranges: %r to %r and %r to %r'
+					% (self.start, self.end, other.start, other.end))
+		return other
+	
+	def __repr__(self):
+		return '%s(%r, %r)' % (self.__class__.__name__, self.start, self.end)
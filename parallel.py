@@ -0,0 +1,107 @@
+import ctypes
+import multiprocessing
+
+import numpy
+
+import recurrence
+
+
+# Parallel expansion of many recurrences over a date range. Occurrence
+# counts are known up front (count_between is O(1)), so every recurrence
+# gets a fixed slice of one shared-memory output buffer; workers write their
+# (recurrence id, day ordinal) pairs straight into it and nothing is sent
+# back through pickling. The output therefore does not depend on the number
+# of workers.
+#
+# Objects without count_between (e.g. RecurrenceSet) have to be expanded to
+# be counted; that is done once, in the calling process, and their
+# occurrences are copied into the buffer there rather than expanded again by
+# the workers.
+
+_CHUNKS_PER_PROCESS = 4
+
+_state = {}
+
+
+def expand_between(recurrences, start, end, processes=None):
+	# Returns an (n, 2) int64 array of (index in recurrences, day ordinal)
+	# rows for every occurrence in the half-open range [start, end), ordered
+	# by recurrence and then by date
+	recurrences = list(recurrences)
+	expanded = {}
+	counts = []
+	for index, rc in enumerate(recurrences):
+		if hasattr(rc, 'count_between'):
+			counts.append(rc.count_between(start, end))
+		else:
+			expanded[index] = [occurrence.toordinal() for occurrence in rc.occurrences_between(start, end)]
+			counts.append(len(expanded[index]))
+	offsets = numpy.concatenate(([0], numpy.cumsum(numpy.array(counts, dtype=numpy.int64))))
+	total = int(offsets[-1])
+
+	output = multiprocessing.RawArray(ctypes.c_int64, max(2 * total, 2))
+	pairs = numpy.frombuffer(output, dtype=numpy.int64).reshape(-1, 2)
+	for index, days in expanded.items():
+		pairs[offsets[index]:offsets[index + 1], 0] = index
+		pairs[offsets[index]:offsets[index + 1], 1] = days
+
+	# Workers only see the recurrences left to expand
+	recurrences = [None if index in expanded else rc for index, rc in enumerate(recurrences)]
+	worker_counts = numpy.array([0 if rc is None else count for rc, count in zip(recurrences, counts)], dtype=numpy.int64)
+	chunks = _split(numpy.concatenate(([0], numpy.cumsum(worker_counts))),
+			(processes or multiprocessing.cpu_count()) * _CHUNKS_PER_PROCESS)
+	state = (recurrences, start, end, offsets, output)
+
+	if processes == 1 or len(chunks) <= 1:
+		_initialize(*state)
+		try:
+			for chunk in chunks:
+				_expand_chunk(chunk)
+		finally:
+			_state.clear()
+	else:
+		pool = multiprocessing.Pool(processes, initializer=_initialize, initargs=state)
+		try:
+			pool.map(_expand_chunk, chunks)
+		finally:
+			pool.close()
+			pool.join()
+
+	return numpy.frombuffer(output, dtype=numpy.int64)[:2 * total].reshape(total, 2)
+
+
+def _split(offsets, parts):
+	# Contiguous ranges of recurrence indexes holding roughly equal numbers
+	# of occurrences
+	size = len(offsets) - 1
+	if size == 0:
+		return []
+	targets = numpy.linspace(0, offsets[-1], parts + 1)[1:-1]
+	bounds = numpy.searchsorted(offsets, targets, side='right') - 1
+	bounds = numpy.unique(numpy.concatenate(([0], bounds, [size])))
+	return [(int(first), int(stop)) for first, stop in zip(bounds[:-1], bounds[1:]) if first < stop]
+
+
+def _initialize(recurrences, start, end, offsets, output):
+	_state['recurrences'] = recurrences
+	_state['range'] = (start, end)
+	_state['offsets'] = offsets
+	_state['pairs'] = numpy.frombuffer(output, dtype=numpy.int64).reshape(-1, 2)
+
+
+def _expand_chunk(chunk):
+	recurrences = _state['recurrences']
+	start, end = _state['range']
+	offsets = _state['offsets']
+	pairs = _state['pairs']
+	for index in range(*chunk):
+		first, stop = offsets[index], offsets[index + 1]
+		rc = recurrences[index]
+		if first == stop or rc is None:
+			continue
+		if hasattr(rc, 'get_occurrences_between'):
+			days = rc.get_occurrences_between(start, end).astype(numpy.int64) + recurrence._EPOCH_DAY_ORDINAL
+		else:
+			days = [occurrence.toordinal() for occurrence in rc.occurrences_between(start, end)]
+		pairs[first:stop, 0] = index
+		pairs[first:stop, 1] = days
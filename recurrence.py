@@ -1,7 +1,21 @@
+import collections
+import functools
+import heapq
 import itertools
 import datetime
+import threading
 import yearmonth
 
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+try:
+	from functools import lru_cache as _lru_cache
+except ImportError:
+	_lru_cache = None
+
 
 DAY_OF_PERIOD = 'DAY_OF_PERIOD'
 
@@ -17,6 +31,193 @@ SUN = SUNDAY    = 6
 FUTURE = +1
 PAST   = -1
 
+_ONE_DAY = datetime.timedelta(days=1)
+
+# Returned by the array methods in place of the number of a non-occurrence
+NO_OCCURRENCE = -2 ** 63
+
+
+def _require_numpy():
+	if numpy is None:
+		raise ImportError('NumPy is required for batch operations')
+
+
+def _as_number_array(numbers):
+	_require_numpy()
+	return numpy.asarray(numbers, dtype=numpy.int64)
+
+
+def _as_date_array(dates):
+	_require_numpy()
+	return numpy.asarray(dates, dtype='datetime64[D]')
+
+
+# Integer code of a MonthsBasedRecurrence day, as used by the array functions,
+# RecurrenceTable and the binary format: the weekday, or -1 for DAY_OF_PERIOD
+_DAY_OF_PERIOD_CODE = -1
+
+
+def _get_day_code(day):
+	return _DAY_OF_PERIOD_CODE if day == DAY_OF_PERIOD else day
+
+
+def _get_day(day_code):
+	return DAY_OF_PERIOD if day_code == _DAY_OF_PERIOD_CODE else day_code
+
+
+# NumPy counts datetime64 values from 1970-01-01, which was a Thursday
+_EPOCH_DAY_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_EPOCH_MONTH_ORDINAL = yearmonth.YearMonth(1970, 1).to_ordinal()
+_EPOCH_WEEKDAY = THURSDAY
+
+
+def _first_days(month_ordinals):
+	months = numpy.asarray(month_ordinals - _EPOCH_MONTH_ORDINAL, dtype=numpy.int64).astype('datetime64[M]')
+	return months.astype('datetime64[D]').astype(numpy.int64)
+
+
+def _days_for_period_codes(month_ordinals, period, ordinal, day_code):
+	# Array counterpart of MonthsBasedRecurrence._date_for_period, working on
+	# month ordinals and returning days since the NumPy epoch. Period, ordinal
+	# and day may all vary per element; days are given as codes (see
+	# _get_day_code)
+	period_lower_bound = _first_days(month_ordinals)
+	period_ceil = _first_days(month_ordinals + period)
+	period_upper_bound = period_ceil - 1
+	negative = ordinal < 0
+	
+	by_day_of_period = numpy.where(negative,
+			period_upper_bound + (ordinal + 1),
+			numpy.where(ordinal > period_ceil - period_lower_bound, period_upper_bound, period_lower_bound + (ordinal - 1))
+		)
+	
+	last_day_of_period = period_upper_bound - _first_days(month_ordinals + period - 1) + 1
+	last_day_of_week = (period_upper_bound + _EPOCH_WEEKDAY) % 7
+	first_day_of_week = (period_lower_bound + _EPOCH_WEEKDAY) % 7
+	day_of_period = numpy.where(negative,
+			last_day_of_period - (7 - day_code + last_day_of_week) % 7 + 7 * (ordinal + 1),
+			1 + (7 + day_code - first_day_of_week) % 7 + 7 * (ordinal - 1)
+		)
+	by_weekday = period_lower_bound + (day_of_period - 1)
+	
+	return numpy.where(day_code < 0, by_day_of_period, by_weekday)
+
+
+def _numbers_after_days(days, anchor, period, ordinal, day_code):
+	# Array counterpart of MonthsBasedRecurrence._get_number_after_ordinal,
+	# with days since the NumPy epoch and month ordinal anchors: start from
+	# the period holding each day and step while the occurrence on either
+	# side is wrong, which takes one step unless occurrences spill out of
+	# their periods
+	month_ordinals = numpy.asarray(days, dtype=numpy.int64).astype('datetime64[D]').astype('datetime64[M]')
+	numbers = (month_ordinals.astype(numpy.int64) + _EPOCH_MONTH_ORDINAL - anchor) // period
+	while True:
+		early = _days_for_period_codes(anchor + numbers * period, period, ordinal, day_code) <= days
+		if not early.any():
+			break
+		numbers = numbers + early
+	while True:
+		late = _days_for_period_codes(anchor + (numbers - 1) * period, period, ordinal, day_code) > days
+		if not late.any():
+			break
+		numbers = numbers - late
+	return numbers
+
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+def _extended_gcd(a, b):
+	# Returns (g, x) such that a * x + b * y == g == gcd(a, b) for some y
+	x0, x1 = 1, 0
+	while b:
+		quotient, remainder = divmod(a, b)
+		a, b = b, remainder
+		x0, x1 = x1, x0 - quotient * x1
+	return a, x0
+
+
+def _search_number_after(get_occurrence_ordinal, number, day_ordinal):
+	# Smallest occurrence number whose day ordinal is after day_ordinal, for
+	# occurrences in increasing order, galloping from a guessed number and
+	# then bisecting; a right guess costs two evaluations
+	step = 1
+	if get_occurrence_ordinal(number) > day_ordinal:
+		while get_occurrence_ordinal(number - step) > day_ordinal:
+			step *= 2
+		low, high = number - step, number - step // 2
+	else:
+		while get_occurrence_ordinal(number + step) <= day_ordinal:
+			step *= 2
+		low, high = number + step // 2, number + step
+	while high - low > 1:
+		middle = (low + high) // 2
+		if get_occurrence_ordinal(middle) > day_ordinal:
+			high = middle
+		else:
+			low = middle
+	return high
+
+
+class _PeriodCache(object):
+	# LRU mapping of period month ordinals to occurrence day ordinals, filled
+	# by compute. A hit must cost less than evaluating the period again, so
+	# lookup is functools.lru_cache where there is one; Python 2 falls back
+	# to an ordered dict behind a lock
+	
+	def __init__(self, maxsize, compute):
+		self.maxsize = maxsize
+		self._compute = compute
+		if _lru_cache is None:
+			self.hits = 0
+			self.misses = 0
+			self._entries = collections.OrderedDict()
+			self._lock = threading.Lock()
+			self.lookup = self._locked_lookup
+		else:
+			self.lookup = _lru_cache(maxsize)(compute)
+	
+	def _locked_lookup(self, key):
+		with self._lock:
+			try:
+				value = self._entries.pop(key)
+			except KeyError:
+				self.misses += 1
+			else:
+				self.hits += 1
+				self._entries[key] = value
+				return value
+		value = self._compute(key)
+		with self._lock:
+			self._entries[key] = value
+			if len(self._entries) > self.maxsize:
+				self._entries.popitem(last=False)
+		return value
+	
+	def info(self):
+		if _lru_cache is not None:
+			return CacheInfo(*self.lookup.cache_info())
+		with self._lock:
+			return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+	
+	def clear(self):
+		if _lru_cache is not None:
+			self.lookup.cache_clear()
+			return
+		with self._lock:
+			self._entries.clear()
+			self.hits = 0
+			self.misses = 0
+	
+	# Only the size and compute survive pickling and deep copies; entries
+	# and lock are recreated empty
+	
+	def __getstate__(self):
+		return self.maxsize, self._compute
+	
+	def __setstate__(self, state):
+		self.__init__(*state)
+
 
 class Recurrence(object):
 	
@@ -25,11 +226,70 @@ class Recurrence(object):
 			occurrence = self.get_occurrence(number)
 			yield occurrence
 	
+	def get_occurrences(self, numbers):
+		numbers = _as_number_array(numbers)
+		occurrences = [self.get_occurrence(int(number)) for number in numbers.flat]
+		return numpy.array(occurrences, dtype='datetime64[D]').reshape(numbers.shape)
+	
+	def are_occurrences(self, candidates):
+		candidates = _as_date_array(candidates)
+		mask = [self.is_occurrence(candidate) for candidate in candidates.astype(object).flat]
+		return numpy.array(mask, dtype=bool).reshape(candidates.shape)
+	
+	def get_occurrence_numbers(self, occurrences):
+		occurrences = _as_date_array(occurrences)
+		numbers = numpy.empty(occurrences.shape, dtype=numpy.int64)
+		for index, occurrence in enumerate(occurrences.astype(object).flat):
+			try:
+				numbers.flat[index] = self.get_occurrence_number(occurrence)
+			except ValueError:
+				numbers.flat[index] = NO_OCCURRENCE
+		return numbers
+	
 	def generate_after(self, date, before=None):
-		occurrence = self.get_occurrence_after(date)
+		number = self._get_number_after(date)
+		occurrence = self.get_occurrence(number)
 		while before is None or occurrence < before:
 			yield occurrence
-			occurrence = self.get_occurrence_after(occurrence)
+			number += 1
+			occurrence = self.get_occurrence(number)
+	
+	def get_occurrence_before(self, date):
+		return self.get_occurrence(self._get_number_before(date))
+	
+	def generate_before(self, date, after=None):
+		number = self._get_number_before(date)
+		occurrence = self.get_occurrence(number)
+		while after is None or occurrence > after:
+			yield occurrence
+			number -= 1
+			occurrence = self.get_occurrence(number)
+	
+	def occurrences_between(self, start, end):
+		# Occurrences in the half-open range [start, end)
+		number, stop = self._get_numbers_between(start, end)
+		while number < stop:
+			yield self.get_occurrence(number)
+			number += 1
+	
+	def get_occurrences_between(self, start, end):
+		_require_numpy()
+		first, stop = self._get_numbers_between(start, end)
+		return self.get_occurrences(numpy.arange(first, stop, dtype=numpy.int64))
+	
+	def count_between(self, start, end):
+		first, stop = self._get_numbers_between(start, end)
+		return stop - first
+	
+	def nth_after(self, date, k):
+		if k < 1:
+			raise ValueError('Invalid k: ' + repr(k))
+		return self.get_occurrence(self._get_number_after(date) + k - 1)
+	
+	def _get_numbers_between(self, start, end):
+		first = self._get_number_after(start - _ONE_DAY)
+		stop = self._get_number_after(end - _ONE_DAY)
+		return first, max(first, stop)
 	
 	def __ne__(self, other):
 		return not (self == other)
@@ -43,12 +303,31 @@ class DaysBasedRecurrence(Recurrence):
 		
 		self.anchor = anchor
 		self.period = period
+		self._anchor_ordinal = anchor.toordinal()
 	
 	def get_occurrence(self, number):
 		delta_days = number * self.period
 		delta = datetime.timedelta(days=delta_days)
 		return self.anchor + delta
 	
+	def get_occurrences(self, numbers):
+		numbers = _as_number_array(numbers)
+		anchor = numpy.datetime64(self.anchor, 'D')
+		return anchor + (numbers * self.period).astype('timedelta64[D]')
+	
+	def are_occurrences(self, candidates):
+		delta_days = self._get_delta_days(candidates)
+		return delta_days % self.period == 0
+	
+	def get_occurrence_numbers(self, occurrences):
+		delta_days = self._get_delta_days(occurrences)
+		numbers, remainders = numpy.divmod(delta_days, self.period)
+		return numpy.where(remainders == 0, numbers, NO_OCCURRENCE)
+	
+	def _get_delta_days(self, dates):
+		dates = _as_date_array(dates)
+		return (dates - numpy.datetime64(self.anchor, 'D')).astype(numpy.int64)
+	
 	def is_occurrence(self, candidate):
 		delta = candidate - self.anchor
 		delta_days = delta.days
@@ -70,6 +349,51 @@ class DaysBasedRecurrence(Recurrence):
 		delta = datetime.timedelta(days=delta_days)
 		occurrence = self.anchor + delta
 		return occurrence
+	
+	def _get_number_after(self, date):
+		delta = date - self.anchor
+		return delta.days // self.period + 1
+	
+	# Integer versions of the methods above, taking and returning proleptic
+	# day ordinals (date.toordinal()) without building any date
+	
+	def get_occurrence_ordinal(self, number):
+		return self._anchor_ordinal + number * self.period
+	
+	def is_occurrence_ordinal(self, day_ordinal):
+		return (day_ordinal - self._anchor_ordinal) % self.period == 0
+	
+	def get_occurrence_after_ordinal(self, day_ordinal):
+		delta_days = day_ordinal - self._anchor_ordinal
+		return day_ordinal + self.period - delta_days % self.period
+	
+	def _get_number_before(self, date):
+		delta = date - self.anchor
+		return (delta.days - 1) // self.period
+	
+	def intersect(self, other):
+		# The common occurrences form another DaysBasedRecurrence, anchored at
+		# the first of them on or after self.anchor, or None if there are none
+		if not isinstance(other, DaysBasedRecurrence):
+			raise ValueError('Invalid recurrence instance: ' + repr(other))
+		
+		gcd, x = _extended_gcd(self.period, other.period)
+		delta_days = (other.anchor - self.anchor).days
+		if delta_days % gcd != 0:
+			return None
+		
+		lcm = self.period // gcd * other.period
+		steps = (delta_days // gcd * x) % (other.period // gcd)
+		anchor = self.anchor + datetime.timedelta(days=steps * self.period)
+		return DaysBasedRecurrence(anchor, lcm)
+	
+	@classmethod
+	def _from_fields(cls, anchor, period):
+		# Bulk construction path for trusted values: no validation and no
+		# per-attribute guard
+		rc = _new(cls)
+		rc.__dict__.update(anchor=anchor, period=period, _anchor_ordinal=anchor.toordinal())
+		return rc
 		
 	def __setattr__(self, attr, value):
 		if attr in ('anchor', 'period') and hasattr(self, attr):
@@ -88,77 +412,114 @@ class DaysBasedRecurrence(Recurrence):
 
 class MonthsBasedRecurrence(Recurrence):
 	
-	def __init__(self, anchor, period, ordinal, day=DAY_OF_PERIOD):
+	def __init__(self, anchor, period, ordinal, day=DAY_OF_PERIOD, cache_size=None):
 		if not isinstance(anchor, yearmonth.YearMonth):
 			raise ValueError('Invalid anchor instance: ' + repr(anchor))
 		
 		if day not in (DAY_OF_PERIOD, SUN, MON, TUE, WED, THU, FRI, SAT):
 			raise ValueError('Invalid day: ' + repr(day))
 		
+		if cache_size is not None and cache_size < 1:
+			raise ValueError('Invalid cache size: ' + repr(cache_size))
+		
 		self.anchor = anchor
 		self.period = period
 		self.ordinal = ordinal
 		self.day = day
+		self._anchor_ordinal = anchor.to_ordinal()
+		self._evaluator = _select_evaluator(ordinal, day)
+		self._cache = None if cache_size is None else _PeriodCache(cache_size, functools.partial(self._evaluator, self))
 	
 	def get_occurrence(self, number):
 		ym = self.anchor + number * self.period
 		return self._date_for_period(ym)
 	
+	def get_occurrences(self, numbers):
+		numbers = _as_number_array(numbers)
+		month_ordinals = self.anchor.to_ordinal() + numbers * self.period
+		days = _days_for_period_codes(month_ordinals, self.period, self.ordinal, _get_day_code(self.day))
+		return days.astype('datetime64[D]')
+	
+	def are_occurrences(self, candidates):
+		return self._get_numbers_and_mask(candidates)[1]
+	
+	def get_occurrence_numbers(self, occurrences):
+		numbers, mask = self._get_numbers_and_mask(occurrences)
+		return numpy.where(mask, numbers, NO_OCCURRENCE)
+	
+	def _get_numbers_and_mask(self, dates):
+		days = _as_date_array(dates).astype(numpy.int64)
+		day_code = _get_day_code(self.day)
+		numbers = _numbers_after_days(days - 1, self._anchor_ordinal, self.period, self.ordinal, day_code)
+		expected_days = _days_for_period_codes(self._anchor_ordinal + numbers * self.period, self.period, self.ordinal, day_code)
+		return numbers, expected_days == days
+	
 	def is_occurrence(self, candidate_occurrence):
-		ym = yearmonth.YearMonth.from_date(candidate_occurrence)
-		delta = ym - self.anchor
-		if delta % self.period != 0:
-			return False
-		else:
-			return self._date_for_period(ym) == candidate_occurrence
+		number = self._get_number_after_ordinal(candidate_occurrence.toordinal() - 1)
+		return self._date_for_period(self.anchor + number * self.period) == candidate_occurrence
 	
 	def get_occurrence_number(self, occurrence):
-		ym = yearmonth.YearMonth.from_date(occurrence)
-		delta = ym - self.anchor
-		if delta % self.period == 0 and self._date_for_period(ym) == occurrence:
-			return delta // self.period
+		number = self._get_number_after_ordinal(occurrence.toordinal() - 1)
+		if self._date_for_period(self.anchor + number * self.period) == occurrence:
+			return number
 		else:
 			raise ValueError('The date %r is not a valid occurrence' % occurrence)
 	
 	def get_occurrence_after(self, date):
-		ym = yearmonth.YearMonth.from_date(date)
-		delta = ym - self.anchor
-		remainder = delta % self.period
-		if remainder != 0:
-			ym += self.period - remainder
-		occurrence = self._date_for_period(ym)
-		if remainder == 0 and occurrence <= date:
-			ym += self.period
-			occurrence = self._date_for_period(ym)
-		return occurrence
+		return self._date_for_period(self.anchor + self._get_number_after(date) * self.period)
+	
+	def _get_number_after(self, date):
+		return self._get_number_after_ordinal(date.toordinal())
+	
+	def _get_number_before(self, date):
+		return self._get_number_after_ordinal(date.toordinal() - 1) - 1
+	
+	def _get_number_after_ordinal(self, day_ordinal):
+		# An occurrence need not fall in the first month of its period (e.g.
+		# the last day of a quarter) and may even spill out of the period, so
+		# the period holding the day is only where the search starts
+		month_ordinal = yearmonth.month_ordinal_for_day(day_ordinal)
+		number = (month_ordinal - self._anchor_ordinal) // self.period
+		return _search_number_after(self.get_occurrence_ordinal, number, day_ordinal)
+	
+	# Integer versions of the methods above, taking and returning proleptic
+	# day ordinals (date.toordinal()) without building any date or YearMonth
+	
+	def get_occurrence_ordinal(self, number):
+		if self._cache is None:
+			return self._evaluator(self, self._anchor_ordinal + number * self.period)
+		else:
+			return self._cache.lookup(self._anchor_ordinal + number * self.period)
+	
+	def is_occurrence_ordinal(self, day_ordinal):
+		return self.get_occurrence_ordinal(self._get_number_after_ordinal(day_ordinal - 1)) == day_ordinal
+	
+	def get_occurrence_after_ordinal(self, day_ordinal):
+		return self.get_occurrence_ordinal(self._get_number_after_ordinal(day_ordinal))
+	
+	def cache_info(self):
+		if self._cache is None:
+			return None
+		return self._cache.info()
+	
+	def cache_clear(self):
+		if self._cache is not None:
+			self._cache.clear()
 	
 	def _date_for_period(self, ym):
-		# TODO assert period > 0
-		period_lower_bound_date = ym.get_first_day()
-		period_ym_upper_bound = ym + self.period - 1
-		period_upper_bound_date = period_ym_upper_bound.get_last_day()
-		period_ym_ceil = ym + self.period
-		period_ceil_date = period_ym_ceil.get_first_day()
-		if self.day == DAY_OF_PERIOD:
-			if self.ordinal < 0:
-				return period_upper_bound_date + datetime.timedelta(days=self.ordinal+1)
-			else:
-				period_delta = period_ceil_date - period_lower_bound_date
-				if self.ordinal > period_delta.days:
-					return period_upper_bound_date
-				else:
-					return period_lower_bound_date + datetime.timedelta(days=self.ordinal-1)
+		if self._cache is None:
+			return datetime.date.fromordinal(self._evaluator(self, ym.to_ordinal()))
 		else:
-			if self.ordinal < 0:
-				last_day_of_period = period_upper_bound_date.day
-				last_day_of_week = period_upper_bound_date.weekday()
-				day_of_period = last_day_of_period  - (7 - self.day + last_day_of_week ) % 7 + 7 * (self.ordinal + 1)
-				return period_lower_bound_date + datetime.timedelta(days=day_of_period-1)
-			else:
-				first_day_of_period = 1
-				first_day_of_week = period_lower_bound_date.weekday()
-				day_of_period = first_day_of_period + (7 + self.day - first_day_of_week) % 7 + 7 * (self.ordinal - 1)
-				return period_lower_bound_date + datetime.timedelta(days=day_of_period-1)
+			return datetime.date.fromordinal(self._cache.lookup(ym.to_ordinal()))
+	
+	@classmethod
+	def _from_fields(cls, anchor, period, ordinal, day):
+		# Bulk construction path for trusted values: no validation, no
+		# per-attribute guard and no cache
+		rc = _new(cls)
+		rc.__dict__.update(anchor=anchor, period=period, ordinal=ordinal, day=day,
+				_anchor_ordinal=anchor.to_ordinal(), _evaluator=_select_evaluator(ordinal, day), _cache=None)
+		return rc
 	
 	def __setattr__(self, attr, value):
 		if attr in ('anchor', 'period', 'ordinal', 'day') and hasattr(self, attr):
@@ -174,5 +535,118 @@ class MonthsBasedRecurrence(Recurrence):
 		)
 	
 	def __hash__(self):
-		return hash(self.anchor) ^ hash(self.period) ^ hash(self.ordinal) ^ hash(self.day)  
+		return hash(self.anchor) ^ hash(self.period) ^ hash(self.ordinal) ^ hash(self.day)
+
+
+# Day ordinal of the occurrence in the period starting at a month ordinal,
+# one function per (day, sign of ordinal) combination of MonthsBasedRecurrence.
+# They are plain functions rather than closures so that recurrences still
+# pickle.
+
+def _nth_day_of_period(rc, month_ordinal):
+	period_lower_bound = yearmonth.month_info(month_ordinal)[0]
+	period_ceil = yearmonth.month_info(month_ordinal + rc.period)[0]
+	if rc.ordinal > period_ceil - period_lower_bound:
+		return period_ceil - 1
+	return period_lower_bound + rc.ordinal - 1
+
+
+def _nth_last_day_of_period(rc, month_ordinal):
+	return yearmonth.month_info(month_ordinal + rc.period)[0] + rc.ordinal
+
+
+def _nth_weekday_of_period(rc, month_ordinal):
+	period_lower_bound, _, first_day_of_week = yearmonth.month_info(month_ordinal)
+	return period_lower_bound + (7 + rc.day - first_day_of_week) % 7 + 7 * (rc.ordinal - 1)
+
+
+def _nth_last_weekday_of_period(rc, month_ordinal):
+	period_lower_bound = yearmonth.month_info(month_ordinal)[0]
+	_, last_day_of_period, last_month_first_day_of_week = yearmonth.month_info(month_ordinal + rc.period - 1)
+	last_day_of_week = (last_month_first_day_of_week + last_day_of_period - 1) % 7
+	return (period_lower_bound + last_day_of_period - 1
+			- (7 - rc.day + last_day_of_week) % 7 + 7 * (rc.ordinal + 1))
+
+
+def _select_evaluator(ordinal, day):
+	if day == DAY_OF_PERIOD:
+		return _nth_last_day_of_period if ordinal < 0 else _nth_day_of_period
+	else:
+		return _nth_last_weekday_of_period if ordinal < 0 else _nth_weekday_of_period
 
+
+class RecurrenceCursor(object):
+	# Position on a recurrence (occurrence number and date) that moves by
+	# single occurrences. The previous occurrence is remembered, so seeking
+	# to a date that is still before the current occurrence costs nothing.
+	# seek() steps from the current position when the target is at most
+	# max_steps occurrences away and falls back to the closed-form lookup
+	# otherwise.
+	
+	def __init__(self, recurrence, number=0, max_steps=8):
+		self.recurrence = recurrence
+		self.max_steps = max_steps
+		self._move_to(number)
+	
+	def next(self):
+		self._previous = self.occurrence
+		self.number += 1
+		self.occurrence = self.recurrence.get_occurrence(self.number)
+		return self.occurrence
+	
+	def prev(self):
+		self.occurrence = self._get_previous()
+		self.number -= 1
+		self._previous = None
+		return self.occurrence
+	
+	def seek(self, date):
+		# Moves to the first occurrence after date, as get_occurrence_after
+		if self.occurrence > date:
+			for _ in range(self.max_steps + 1):
+				if self._get_previous() <= date:
+					return self.occurrence
+				self.prev()
+		else:
+			for _ in range(self.max_steps):
+				if self.next() > date:
+					return self.occurrence
+		
+		self._move_to(self.recurrence._get_number_after(date))
+		return self.occurrence
+	
+	def _move_to(self, number):
+		self.number = number
+		self.occurrence = self.recurrence.get_occurrence(number)
+		self._previous = None
+	
+	def _get_previous(self):
+		if self._previous is None:
+			self._previous = self.recurrence.get_occurrence(self.number - 1)
+		return self._previous
+
+
+_new = object.__new__
+
+
+def merge_after(recurrences, date, before=None):
+	# Yields (occurrence, recurrence) pairs of all recurrences in date order,
+	# keeping a single pending occurrence per recurrence in a heap. Ties are
+	# yielded in the order the recurrences were given.
+	heap = []
+	for index, rc in enumerate(recurrences):
+		occurrence = rc.get_occurrence_after(date)
+		if occurrence is not None:
+			heap.append((occurrence, index, rc))
+	heapq.heapify(heap)
+	
+	while heap:
+		occurrence, index, rc = heap[0]
+		if before is not None and occurrence >= before:
+			return
+		yield occurrence, rc
+		next_occurrence = rc.get_occurrence_after(occurrence)
+		if next_occurrence is None:
+			heapq.heappop(heap)
+		else:
+			heapq.heapreplace(heap, (next_occurrence, index, rc))
@@ -0,0 +1,103 @@
+import yearmonth
+import recurrence
+
+
+class RecurrenceIndex(object):
+	# Days-based recurrences are bucketed by period and anchor residue, and
+	# months-based ones additionally by ordinal and day, so a lookup only
+	# touches the buckets whose residue matches the date. Recurrences are
+	# tracked by identity: equal but distinct instances are kept apart.
+	
+	def __init__(self, recurrences=()):
+		self._days_based = {}
+		self._months_based = {}
+		self._others = {}
+		self._size = 0
+		for rc in recurrences:
+			self.add(rc)
+	
+	def add(self, rc):
+		bucket = self._get_bucket(rc, create=True)
+		if id(rc) not in bucket:
+			bucket[id(rc)] = rc
+			self._size += 1
+	
+	def remove(self, rc):
+		bucket = self._get_bucket(rc, create=False)
+		if bucket is None or id(rc) not in bucket:
+			raise KeyError(rc)
+		del bucket[id(rc)]
+		self._size -= 1
+		if not bucket:
+			self._discard_bucket(rc)
+	
+	def get_recurrences_on(self, date):
+		found = []
+		
+		day_ordinal = date.toordinal()
+		for period, buckets in self._days_based.items():
+			bucket = buckets.get(day_ordinal % period)
+			if bucket:
+				found.extend(bucket.values())
+		
+		month_ordinal = yearmonth.month_ordinal_for_day(day_ordinal)
+		for (period, _, _), buckets in self._months_based.items():
+			# The occurrence in a period only depends on the group key and the
+			# month the period starts in, and moves forward with that month.
+			# It may fall after the first month of the period or spill out of
+			# it, so search for the period start whose occurrence is the date.
+			representative = next(iter(next(iter(buckets.values())).values()))
+			evaluate = lambda start: representative._evaluator(representative, start)
+			start = recurrence._search_number_after(evaluate, month_ordinal, day_ordinal - 1)
+			if evaluate(start) == day_ordinal:
+				bucket = buckets.get(start % period)
+				if bucket:
+					found.extend(bucket.values())
+		
+		for rc in self._others.values():
+			if rc.is_occurrence(date):
+				found.append(rc)
+		
+		return found
+	
+	def _get_bucket(self, rc, create):
+		groups, group_key, residue = self._locate(rc)
+		if group_key is None:
+			return groups
+		if create:
+			return groups.setdefault(group_key, {}).setdefault(residue, {})
+		return groups.get(group_key, {}).get(residue)
+	
+	def _discard_bucket(self, rc):
+		groups, group_key, residue = self._locate(rc)
+		if group_key is None:
+			return
+		buckets = groups[group_key]
+		del buckets[residue]
+		if not buckets:
+			del groups[group_key]
+	
+	def _locate(self, rc):
+		if isinstance(rc, recurrence.DaysBasedRecurrence):
+			return self._days_based, rc.period, rc.anchor.toordinal() % rc.period
+		elif isinstance(rc, recurrence.MonthsBasedRecurrence):
+			group_key = (rc.period, rc.ordinal, rc.day)
+			return self._months_based, group_key, rc.anchor.to_ordinal() % rc.period
+		else:
+			return self._others, None, None
+	
+	def __len__(self):
+		return self._size
+	
+	def __contains__(self, rc):
+		bucket = self._get_bucket(rc, create=False)
+		return bucket is not None and id(rc) in bucket
+	
+	def __iter__(self):
+		for groups in (self._days_based, self._months_based):
+			for buckets in groups.values():
+				for bucket in buckets.values():
+					for rc in bucket.values():
+						yield rc
+		for rc in self._others.values():
+			yield rc
@@ -0,0 +1,32 @@
+import recurrence
+import yearmonth
+
+
+# Straightforward versions of optimized code paths, kept so that tests can
+# check the fast versions against them and benchmarks can measure the gain
+
+
+def day_for_month_ordinal(rc, month_ordinal):
+	# Day ordinal of the occurrence in the period starting at a month
+	# ordinal, handling every (day, ordinal) combination in one function; the
+	# evaluators picked by recurrence._select_evaluator compute the same thing
+	# for a single one
+	period_lower_bound, _, first_day_of_week = yearmonth.month_info(month_ordinal)
+	period_ceil = yearmonth.month_info(month_ordinal + rc.period)[0]
+	period_upper_bound = period_ceil - 1
+	if rc.day == recurrence.DAY_OF_PERIOD:
+		if rc.ordinal < 0:
+			occurrence = period_upper_bound + rc.ordinal + 1
+		elif rc.ordinal > period_ceil - period_lower_bound:
+			occurrence = period_upper_bound
+		else:
+			occurrence = period_lower_bound + rc.ordinal - 1
+	else:
+		if rc.ordinal < 0:
+			last_day_of_period = yearmonth.month_info(month_ordinal + rc.period - 1)[1]
+			last_day_of_week = (period_upper_bound + 6) % 7
+			day_of_period = last_day_of_period - (7 - rc.day + last_day_of_week) % 7 + 7 * (rc.ordinal + 1)
+		else:
+			day_of_period = 1 + (7 + rc.day - first_day_of_week) % 7 + 7 * (rc.ordinal - 1)
+		occurrence = period_lower_bound + day_of_period - 1
+	return occurrence
@@ -0,0 +1,68 @@
+import bisect
+import heapq
+
+
+class RecurrenceSet(object):
+	# Union of recurrences and extra dates, minus exclusion recurrences and
+	# dates. Explicit dates are kept in sorted lists searched with bisect, and
+	# unbounded streams are only merged lazily.
+	
+	def __init__(self, recurrences=(), dates=(), exclusions=(), exdates=()):
+		self.recurrences = tuple(recurrences)
+		self.dates = sorted(set(dates))
+		self.exclusions = tuple(exclusions)
+		self.exdates = sorted(set(exdates))
+	
+	def is_occurrence(self, candidate):
+		if self._is_excluded(candidate):
+			return False
+		return (_contains(self.dates, candidate)
+				or any(rc.is_occurrence(candidate) for rc in self.recurrences))
+	
+	def get_occurrence_after(self, date):
+		# Returns None once there are no more occurrences. Like rrule, this
+		# does not terminate if the exclusions cover every later occurrence.
+		while True:
+			candidate = self._get_candidate_after(date)
+			if candidate is None or not self._is_excluded(candidate):
+				return candidate
+			date = candidate
+	
+	def generate_after(self, date, before=None):
+		streams = [rc.generate_after(date, before) for rc in self.recurrences]
+		streams.append(self._dates_between(bisect.bisect_right(self.dates, date), before))
+		return self._filter(heapq.merge(*streams))
+	
+	def occurrences_between(self, start, end):
+		# Occurrences in the half-open range [start, end)
+		streams = [rc.occurrences_between(start, end) for rc in self.recurrences]
+		streams.append(self._dates_between(bisect.bisect_left(self.dates, start), end))
+		return self._filter(heapq.merge(*streams))
+	
+	def _get_candidate_after(self, date):
+		candidates = [rc.get_occurrence_after(date) for rc in self.recurrences]
+		index = bisect.bisect_right(self.dates, date)
+		if index < len(self.dates):
+			candidates.append(self.dates[index])
+		candidates = [candidate for candidate in candidates if candidate is not None]
+		return min(candidates) if candidates else None
+	
+	def _dates_between(self, index, before):
+		stop = len(self.dates) if before is None else bisect.bisect_left(self.dates, before)
+		return iter(self.dates[index:stop])
+	
+	def _filter(self, occurrences):
+		previous = None
+		for occurrence in occurrences:
+			if occurrence != previous and not self._is_excluded(occurrence):
+				yield occurrence
+			previous = occurrence
+	
+	def _is_excluded(self, date):
+		return (_contains(self.exdates, date)
+				or any(rc.is_occurrence(date) for rc in self.exclusions))
+
+
+def _contains(sorted_dates, date):
+	index = bisect.bisect_left(sorted_dates, date)
+	return index < len(sorted_dates) and sorted_dates[index] == date
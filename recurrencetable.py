@@ -0,0 +1,132 @@
+import datetime
+import numpy
+
+from yearmonth import YearMonth
+import recurrence
+from serialization import DAYS_BASED, MONTHS_BASED
+
+
+class RecurrenceTable(object):
+	# Many recurrences stored as parallel integer columns: kind, anchor (a
+	# proleptic day ordinal for days-based rows, a month ordinal for
+	# months-based ones), period, ordinal and day code (-1 for DAY_OF_PERIOD).
+	# Queries are answered for every row at once and agree row by row with
+	# the corresponding Recurrence methods.
+
+	def __init__(self, kind, anchor, period, ordinal, day):
+		self.kind = numpy.asarray(kind, dtype=numpy.int8)
+		self.anchor = numpy.asarray(anchor, dtype=numpy.int64)
+		self.period = numpy.asarray(period, dtype=numpy.int64)
+		self.ordinal = numpy.asarray(ordinal, dtype=numpy.int64)
+		self.day = numpy.asarray(day, dtype=numpy.int64)
+
+		size = len(self.kind)
+		for column in (self.anchor, self.period, self.ordinal, self.day):
+			if column.shape != (size, ):
+				raise ValueError('Columns must be one-dimensional and of the same length')
+		if not numpy.all((self.kind == DAYS_BASED) | (self.kind == MONTHS_BASED)):
+			raise ValueError('Invalid kind column')
+
+		self._days_based = self.kind == DAYS_BASED
+		self._months_based = ~self._days_based
+
+	@staticmethod
+	def from_recurrences(recurrences):
+		columns = ([], [], [], [], [])
+		for rc in recurrences:
+			if isinstance(rc, recurrence.DaysBasedRecurrence):
+				row = (DAYS_BASED, rc.anchor.toordinal(), rc.period, 0, 0)
+			elif isinstance(rc, recurrence.MonthsBasedRecurrence):
+				row = (MONTHS_BASED, rc.anchor.to_ordinal(), rc.period, rc.ordinal, recurrence._get_day_code(rc.day))
+			else:
+				raise ValueError('Unsupported recurrence: ' + repr(rc))
+			for column, value in zip(columns, row):
+				column.append(value)
+		return RecurrenceTable(*columns)
+
+	def __len__(self):
+		return len(self.kind)
+
+	def get_recurrence(self, row):
+		if self.kind[row] == DAYS_BASED:
+			anchor = datetime.date.fromordinal(int(self.anchor[row]))
+			return recurrence.DaysBasedRecurrence(anchor, int(self.period[row]))
+		else:
+			day = recurrence._get_day(int(self.day[row]))
+			return recurrence.MonthsBasedRecurrence(YearMonth.from_ordinal(int(self.anchor[row])),
+					int(self.period[row]), int(self.ordinal[row]), day)
+
+	def next_after(self, date):
+		rows = numpy.arange(len(self))
+		numbers = self._get_numbers_after(date)
+		return _to_datetime64(self._get_occurrence_days(rows, numbers))
+
+	def is_occurrence(self, date):
+		day = _to_days(date)
+		mask = numpy.zeros(len(self), dtype=bool)
+
+		rows = self._days_based
+		mask[rows] = (day - self._anchor_days(rows)) % self.period[rows] == 0
+
+		rows = self._months_based
+		anchor, period, ordinal, day_code = self.anchor[rows], self.period[rows], self.ordinal[rows], self.day[rows]
+		numbers = recurrence._numbers_after_days(day - 1, anchor, period, ordinal, day_code)
+		mask[rows] = recurrence._days_for_period_codes(anchor + numbers * period, period, ordinal, day_code) == day
+
+		return mask
+
+	def occurrences_between(self, start, end):
+		# Occurrences in the half-open range [start, end), as a pair of
+		# arrays: the row of each occurrence and its date, ordered by row and
+		# then by date
+		one_day = datetime.timedelta(days=1)
+		first = self._get_numbers_after(start - one_day)
+		stop = self._get_numbers_after(end - one_day)
+		counts = numpy.maximum(stop - first, 0)
+
+		rows = numpy.repeat(numpy.arange(len(self)), counts)
+		offsets = numpy.arange(len(rows)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+		numbers = first[rows] + offsets
+		return rows, _to_datetime64(self._get_occurrence_days(rows, numbers))
+
+	def _get_numbers_after(self, date):
+		# Row by row equivalent of Recurrence._get_number_after
+		numbers = numpy.empty(len(self), dtype=numpy.int64)
+		day = _to_days(date)
+
+		rows = self._days_based
+		numbers[rows] = (day - self._anchor_days(rows)) // self.period[rows] + 1
+
+		rows = self._months_based
+		numbers[rows] = recurrence._numbers_after_days(day, self.anchor[rows], self.period[rows],
+				self.ordinal[rows], self.day[rows])
+
+		return numbers
+
+	def _get_occurrence_days(self, rows, numbers):
+		# Days since the NumPy epoch of occurrence numbers[i] of row rows[i]
+		days = numpy.empty(len(rows), dtype=numpy.int64)
+
+		selected = self._days_based[rows]
+		days_rows = rows[selected]
+		days[selected] = self._anchor_days(days_rows) + numbers[selected] * self.period[days_rows]
+
+		selected = ~selected
+		months_rows = rows[selected]
+		period = self.period[months_rows]
+		month_ordinals = self.anchor[months_rows] + numbers[selected] * period
+		days[selected] = recurrence._days_for_period_codes(month_ordinals, period,
+				self.ordinal[months_rows], self.day[months_rows])
+
+		return days
+
+	def _anchor_days(self, rows):
+		return self.anchor[rows] - recurrence._EPOCH_DAY_ORDINAL
+
+
+def _to_days(date):
+	return date.toordinal() - recurrence._EPOCH_DAY_ORDINAL
+
+
+def _to_datetime64(days):
+	return days.astype('datetime64[D]')
@@ -0,0 +1,160 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+
+
+# asyncio scheduler firing callbacks when recurrences occur. All schedules
+# share one heap of next fire times; the scheduler sleeps until the earliest
+# one, calls its callback and re-arms it with get_occurrence_after. Removed
+# schedules are dropped lazily when they reach the top of the heap, or all
+# at once when they make up more than half of it, which keeps the heap
+# within twice the number of live schedules.
+#
+# An occurrence fires at time_of_day on its date. The clock and the sleep
+# coroutine can be replaced, e.g. to run tests in virtual time.
+#
+# An exception raised by a callback, or by the coroutine it returns, is
+# passed to error_handler as an asyncio exception context and every schedule
+# keeps running. By default it goes to the loop's exception handler.
+
+
+class Schedule(object):
+
+	def __init__(self, recurrence, callback, occurrence):
+		self.recurrence = recurrence
+		self.callback = callback
+		self.occurrence = occurrence
+		self.cancelled = False
+
+
+class Scheduler(object):
+
+	def __init__(self, clock=datetime.datetime.now, sleep=asyncio.sleep, time_of_day=datetime.time(), error_handler=None):
+		self._clock = clock
+		self._sleep = sleep
+		self._time_of_day = time_of_day
+		self._error_handler = error_handler
+		self._heap = []
+		self._counter = itertools.count()
+		self._size = 0
+		self._cancelled = 0
+		self._wakeup = None
+		self._stopped = False
+		self._tasks = set()
+
+	def add(self, recurrence, callback, after=None):
+		# Fires on every occurrence after the given date; by default today's
+		# occurrence is included
+		if after is None:
+			after = self._clock().date() - datetime.timedelta(days=1)
+		schedule = Schedule(recurrence, callback, recurrence.get_occurrence_after(after))
+		if schedule.occurrence is None:
+			schedule.cancelled = True
+		else:
+			self._size += 1
+			self._push(schedule)
+		return schedule
+
+	def remove(self, schedule):
+		if schedule.cancelled:
+			raise ValueError('Schedule already removed')
+		schedule.cancelled = True
+		self._size -= 1
+		self._cancelled += 1
+		if self._cancelled * 2 > len(self._heap):
+			self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+			heapq.heapify(self._heap)
+			self._cancelled = 0
+		self._wake()
+
+	def __len__(self):
+		return self._size
+
+	def get_next_fire_time(self):
+		self._discard_cancelled()
+		return self._heap[0][0] if self._heap else None
+
+	def stop(self):
+		self._stopped = True
+		self._wake()
+
+	async def run(self):
+		self._stopped = False
+		self._wakeup = asyncio.Event()
+		try:
+			while not self._stopped:
+				self._wakeup.clear()
+				fire_time = self.get_next_fire_time()
+				if fire_time is None:
+					await self._wakeup.wait()
+					continue
+				delay = (fire_time - self._clock()).total_seconds()
+				if delay > 0:
+					await self._sleep_or_wake(delay)
+					continue
+				_, _, schedule = heapq.heappop(self._heap)
+				self._fire(schedule)
+		finally:
+			self._wakeup = None
+
+	async def _sleep_or_wake(self, delay):
+		sleeper = asyncio.ensure_future(self._sleep(delay))
+		waker = asyncio.ensure_future(self._wakeup.wait())
+		try:
+			await asyncio.wait((sleeper, waker), return_when=asyncio.FIRST_COMPLETED)
+		finally:
+			sleeper.cancel()
+			waker.cancel()
+
+	def _fire(self, schedule):
+		occurrence = schedule.occurrence
+		schedule.occurrence = schedule.recurrence.get_occurrence_after(occurrence)
+		if schedule.occurrence is None:
+			schedule.cancelled = True
+			self._size -= 1
+		else:
+			self._push(schedule)
+
+		try:
+			result = schedule.callback(occurrence, schedule.recurrence)
+		except Exception as exception:
+			self._report(exception, schedule, occurrence)
+			return
+		if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+			task = asyncio.ensure_future(result)
+			self._tasks.add(task)
+			task.add_done_callback(lambda task: self._task_done(task, schedule, occurrence))
+
+	def _task_done(self, task, schedule, occurrence):
+		self._tasks.discard(task)
+		if not task.cancelled() and task.exception() is not None:
+			self._report(task.exception(), schedule, occurrence)
+
+	def _report(self, exception, schedule, occurrence):
+		context = {
+			'message': 'Exception in callback for occurrence %s' % occurrence,
+			'exception': exception,
+			'schedule': schedule,
+			'occurrence': occurrence,
+		}
+		if self._error_handler is not None:
+			self._error_handler(context)
+		else:
+			asyncio.get_event_loop().call_exception_handler(context)
+
+	def _push(self, schedule):
+		fire_time = datetime.datetime.combine(schedule.occurrence, self._time_of_day)
+		entry = (fire_time, next(self._counter), schedule)
+		heapq.heappush(self._heap, entry)
+		if self._heap[0] is entry:
+			self._wake()
+
+	def _discard_cancelled(self):
+		while self._heap and self._heap[0][2].cancelled:
+			heapq.heappop(self._heap)
+			self._cancelled -= 1
+
+	def _wake(self):
+		if self._wakeup is not None:
+			self._wakeup.set()
@@ -0,0 +1,98 @@
+import struct
+import datetime
+
+from yearmonth import YearMonth
+import recurrence
+
+
+# Fixed-width binary format for bulk storage of recurrences.
+#
+# Header (12 bytes, little endian):
+#   magic 'RCUR', format version (uint16), record size (uint16),
+#   record count (uint32)
+# Record (16 bytes, little endian):
+#   kind (uint8), day (int8), padding (2 bytes), anchor (int32),
+#   period (int32), ordinal (int32)
+#
+# The anchor is a proleptic day ordinal for days-based recurrences and a
+# month ordinal for months-based ones. Day codes are the weekday values and
+# -1 for DAY_OF_PERIOD; days-based records store 0 for day and ordinal.
+
+MAGIC = b'RCUR'
+VERSION = 1
+
+DAYS_BASED = 1
+MONTHS_BASED = 2
+
+_HEADER = struct.Struct('<4sHHI')
+_RECORD = struct.Struct('<Bbxxiii')
+
+
+def dumps(recurrences):
+	recurrences = list(recurrences)
+	chunks = [_HEADER.pack(MAGIC, VERSION, _RECORD.size, len(recurrences))]
+	pack = _RECORD.pack
+	for rc in recurrences:
+		if isinstance(rc, recurrence.DaysBasedRecurrence):
+			chunks.append(pack(DAYS_BASED, 0, rc.anchor.toordinal(), rc.period, 0))
+		elif isinstance(rc, recurrence.MonthsBasedRecurrence):
+			chunks.append(pack(MONTHS_BASED, recurrence._get_day_code(rc.day), rc.anchor.to_ordinal(), rc.period, rc.ordinal))
+		else:
+			raise ValueError('Unsupported recurrence: ' + repr(rc))
+	return b''.join(chunks)
+
+
+def loads(buffer):
+	buffer = memoryview(buffer)
+	if len(buffer) < _HEADER.size:
+		raise ValueError('Truncated header')
+	magic, version, record_size, count = _HEADER.unpack_from(buffer, 0)
+	if magic != MAGIC:
+		raise ValueError('Invalid magic: ' + repr(magic))
+	if version != VERSION:
+		raise ValueError('Unsupported format version: ' + repr(version))
+	if record_size != _RECORD.size:
+		raise ValueError('Invalid record size: ' + repr(record_size))
+	if len(buffer) != _HEADER.size + count * record_size:
+		raise ValueError('Invalid buffer length for %d records: %d' % (count, len(buffer)))
+	
+	days = (0, 1, 2, 3, 4, 5, 6, recurrence.DAY_OF_PERIOD)
+	new_days_based = recurrence.DaysBasedRecurrence._from_fields
+	new_months_based = recurrence.MonthsBasedRecurrence._from_fields
+	# Anchors are immutable, so records with the same anchor share one object
+	dates = {}
+	yms = {}
+	
+	recurrences = []
+	append = recurrences.append
+	for index, (kind, day, anchor, period, ordinal) in enumerate(_iter_records(buffer[_HEADER.size:])):
+		if kind == DAYS_BASED:
+			anchor_date = dates.get(anchor)
+			if anchor_date is None:
+				anchor_date = dates[anchor] = datetime.date.fromordinal(anchor)
+			append(new_days_based(anchor_date, period))
+		elif kind == MONTHS_BASED:
+			if not -1 <= day <= 6:
+				raise ValueError('Invalid day code in record %d: %r' % (index, day))
+			ym = yms.get(anchor)
+			if ym is None:
+				ym = yms[anchor] = YearMonth.from_ordinal(anchor)
+			append(new_months_based(ym, period, ordinal, days[day]))
+		else:
+			raise ValueError('Invalid kind in record %d: %r' % (index, kind))
+	return recurrences
+
+
+def _iter_records(body):
+	if hasattr(_RECORD, 'iter_unpack'):
+		return _RECORD.iter_unpack(body)
+	unpack_from = _RECORD.unpack_from
+	return (unpack_from(body, offset) for offset in range(0, len(body), _RECORD.size))
+
+
+def dump(recurrences, f):
+	f.write(dumps(recurrences))
+
+
+def load(f):
+	return loads(f.read())
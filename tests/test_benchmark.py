@@ -0,0 +1,25 @@
+import unittest
+import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+	
+	def result(self, **seconds):
+		return {'results': dict((name, {'seconds': value}) for name, value in seconds.items())}
+	
+	def testCompare(self):
+		baseline = self.result(a=1.0, b=2.0, c=3.0)
+		current = self.result(a=1.05, b=3.0, c=1.0, d=5.0)
+		self.assertEqual(benchmark.compare(current, baseline, threshold=0.1), [('b', 2.0, 3.0, 1.5)])
+		self.assertEqual(benchmark.compare(current, baseline, threshold=0.01), [('a', 1.0, 1.05, 1.05), ('b', 2.0, 3.0, 1.5)])
+	
+	def testRun(self):
+		benchmarks = [b for b in benchmark.get_benchmarks() if b[0].startswith('micro.months_based.weekday_negative.')]
+		self.assertEqual(len(benchmarks), 7)
+		current = benchmark.run(benchmarks, repeat=1, scale=0.01)
+		self.assertEqual(sorted(current['results']), sorted(name for name, _, _ in benchmarks))
+		self.assertEqual(benchmark.compare(current, current), [])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import itertools
+from datetime import date, timedelta
+from yearmonth import YearMonth
+from businesscalendar import BusinessCalendar, AdjustedRecurrence, FOLLOWING, PRECEDING, MODIFIED_FOLLOWING
+import recurrence
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+class TestBusinessCalendar(unittest.TestCase):
+	
+	def setUp(self):
+		self.holidays = [
+			date(2012, 4, 6), date(2012, 4, 9),     # Good Friday, Easter Monday
+			date(2012, 4, 30), date(2012, 5, 1),    # bridge and Labour Day
+			date(2012, 6, 30),                      # a Saturday
+			date(2012, 12, 24), date(2012, 12, 25), date(2012, 12, 26), date(2012, 12, 31),
+		]
+		self.calendar = BusinessCalendar(holidays=self.holidays)
+	
+	def isBusinessDay(self, day):
+		return day.weekday() < recurrence.SAT and day not in self.holidays
+	
+	def expected(self, day, rule):
+		if rule == PRECEDING:
+			step = -1
+		else:
+			step = +1
+		adjusted = day
+		while not self.isBusinessDay(adjusted):
+			adjusted += timedelta(days=step)
+		if rule == MODIFIED_FOLLOWING and adjusted.month != day.month:
+			return self.expected(day, PRECEDING)
+		return adjusted
+	
+	def days(self):
+		return [date(2012, 1, 1) + timedelta(days=offset) for offset in range(400)]
+	
+	def testIsBusinessDay(self):
+		for day in self.days():
+			self.assertEqual(self.calendar.is_business_day(day), self.isBusinessDay(day), day)
+	
+	def testAdjust(self):
+		for rule in (FOLLOWING, PRECEDING, MODIFIED_FOLLOWING):
+			for day in self.days():
+				self.assertEqual(self.calendar.adjust(day, rule), self.expected(day, rule), '%s %r' % (rule, day))
+				self.assertEqual(self.calendar.adjust_ordinal(day.toordinal(), rule), self.expected(day, rule).toordinal())
+	
+	def testModifiedFollowingAtMonthEnd(self):
+		self.assertEqual(self.calendar.adjust(date(2012, 6, 30), MODIFIED_FOLLOWING), date(2012, 6, 29))
+		self.assertEqual(self.calendar.adjust(date(2012, 12, 29), MODIFIED_FOLLOWING), date(2012, 12, 28))
+		self.assertEqual(self.calendar.adjust(date(2012, 12, 29), FOLLOWING), date(2013, 1, 1))
+	
+	def testCustomWeekend(self):
+		calendar = BusinessCalendar(weekend=(recurrence.FRI, recurrence.SAT))
+		self.assertEqual(calendar.adjust(date(2012, 4, 6), FOLLOWING), date(2012, 4, 8))
+		self.assertEqual(calendar.adjust(date(2012, 4, 7), PRECEDING), date(2012, 4, 5))
+		self.assertRaises(ValueError, lambda: BusinessCalendar(weekend=range(7)))
+	
+	def testInvalidRule(self):
+		self.assertRaises(ValueError, lambda: self.calendar.adjust(date(2012, 4, 6), 'NEAREST'))
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testAdjustArray(self):
+		days = self.days()
+		for rule in (FOLLOWING, PRECEDING, MODIFIED_FOLLOWING):
+			adjusted = self.calendar.adjust_array(numpy.array(days, dtype='datetime64[D]'), rule)
+			self.assertEqual(adjusted.astype(object).tolist(), [self.expected(day, rule) for day in days])
+
+
+class TestAdjustedRecurrence(unittest.TestCase):
+	
+	def setUp(self):
+		holidays = [date(2012, 4, 6), date(2012, 4, 9), date(2012, 5, 1), date(2012, 6, 15), date(2012, 12, 31)]
+		self.calendar = BusinessCalendar(holidays=holidays)
+		self.recurrences = [
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=15),
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=3, ordinal=-1),
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=1),
+		]
+	
+	def adjusted(self):
+		for rc in self.recurrences:
+			for rule in (FOLLOWING, PRECEDING, MODIFIED_FOLLOWING):
+				yield rc, AdjustedRecurrence(rc, self.calendar, rule)
+	
+	def testGetOccurrence(self):
+		self.assertEqual(AdjustedRecurrence(self.recurrences[0], self.calendar).get_occurrence(2), date(2012, 6, 18))
+		self.assertEqual(AdjustedRecurrence(self.recurrences[1], self.calendar, PRECEDING).get_occurrence(1), date(2012, 6, 29))
+		for rc, adjusted in self.adjusted():
+			for number in range(-20, 20):
+				self.assertEqual(adjusted.get_occurrence(number), self.calendar.adjust(rc.get_occurrence(number), adjusted.rule))
+	
+	def testGetOccurrenceAfterAndBetween(self):
+		start, end = date(2012, 3, 1), date(2013, 2, 1)
+		for rc, adjusted in self.adjusted():
+			occurrences = list(itertools.takewhile(lambda d: d < date(2013, 6, 1), adjusted.generate(first_occurrence_number=-100)))
+			for offset in range(0, 300, 2):
+				day = start + timedelta(days=offset)
+				later = [occurrence for occurrence in occurrences if occurrence > day]
+				self.assertEqual(adjusted.get_occurrence_after(day), later[0], '%r %r' % (adjusted.__dict__, day))
+				self.assertEqual(adjusted.is_occurrence(day), day in occurrences)
+			expected = [occurrence for occurrence in occurrences if start <= occurrence < end]
+			self.assertEqual(list(adjusted.occurrences_between(start, end)), expected)
+			self.assertEqual(adjusted.count_between(start, end), len(expected))
+			self.assertEqual(adjusted.get_occurrence_before(end), expected[-1])
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testBatch(self):
+		for rc, adjusted in self.adjusted():
+			numbers = numpy.arange(-20, 20)
+			self.assertEqual(adjusted.get_occurrences(numbers).astype(object).tolist(),
+					[adjusted.get_occurrence(number) for number in range(-20, 20)]
+				)
+			start, end = date(2012, 3, 1), date(2013, 2, 1)
+			self.assertEqual(adjusted.get_occurrences_between(start, end).astype(object).tolist(),
+					list(adjusted.occurrences_between(start, end))
+				)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import itertools
+from datetime import date
+from yearmonth import YearMonth
+import instrumentation
+import recurrence
+
+
+ORIGINAL_GET_OCCURRENCE = recurrence.DaysBasedRecurrence.__dict__['get_occurrence']
+
+
+class TestInstrumentation(unittest.TestCase):
+	
+	def setUp(self):
+		self.dbr = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3)
+		self.mbr = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI)
+		instrumentation.reset()
+	
+	def tearDown(self):
+		instrumentation.disable()
+		instrumentation.reset()
+	
+	def testDisabledByDefault(self):
+		self.assertFalse(instrumentation.is_enabled())
+		self.assertIs(recurrence.DaysBasedRecurrence.__dict__['get_occurrence'], ORIGINAL_GET_OCCURRENCE)
+		self.dbr.get_occurrence(1)
+		self.assertEqual(instrumentation.snapshot(), {'classes': {}, 'tags': {}})
+	
+	def testEnableAndDisable(self):
+		instrumentation.enable()
+		self.assertTrue(instrumentation.is_enabled())
+		self.assertIsNot(recurrence.DaysBasedRecurrence.__dict__['get_occurrence'], ORIGINAL_GET_OCCURRENCE)
+		instrumentation.disable()
+		self.assertIs(recurrence.DaysBasedRecurrence.__dict__['get_occurrence'], ORIGINAL_GET_OCCURRENCE)
+	
+	def testCounters(self):
+		instrumentation.enable()
+		self.assertEqual(self.dbr.get_occurrence(1), date(2012, 4, 10))
+		self.dbr.get_occurrence(2)
+		self.assertTrue(self.mbr.is_occurrence(date(2012, 4, 27)))
+		snapshot = instrumentation.snapshot()
+		
+		stats = snapshot['classes']['DaysBasedRecurrence']['get_occurrence']
+		self.assertEqual(stats['calls'], 2)
+		self.assertEqual(stats['arguments'], {'int': 2})
+		self.assertTrue(stats['seconds'] >= 0)
+		
+		months_based = snapshot['classes']['MonthsBasedRecurrence']
+		self.assertEqual(months_based['is_occurrence']['calls'], 1)
+		self.assertEqual(months_based['_date_for_period']['calls'], 1)
+		self.assertEqual(months_based['_date_for_period']['arguments'], {'YearMonth': 1})
+	
+	def testGenerators(self):
+		instrumentation.enable()
+		list(itertools.islice(self.mbr.generate_after(date(2012, 1, 1)), 5))
+		list(self.dbr.occurrences_between(date(2012, 4, 7), date(2012, 4, 19)))
+		snapshot = instrumentation.snapshot()
+		
+		generate_after = snapshot['classes']['MonthsBasedRecurrence']['generate_after']
+		self.assertEqual(generate_after['calls'], 1)
+		self.assertEqual(generate_after['yielded'], 5)
+		
+		occurrences_between = snapshot['classes']['DaysBasedRecurrence']['occurrences_between']
+		self.assertEqual(occurrences_between['yielded'], 4)
+		self.assertEqual(occurrences_between['arguments'], {'date, date': 1})
+	
+	def testTags(self):
+		instrumentation.tag(self.dbr, 'billing')
+		instrumentation.enable()
+		self.dbr.get_occurrence_after(date(2012, 4, 7))
+		self.mbr.get_occurrence_after(date(2012, 4, 7))
+		snapshot = instrumentation.snapshot()
+		self.assertEqual(list(snapshot['tags']), ['billing'])
+		self.assertEqual(snapshot['tags']['billing']['get_occurrence_after']['calls'], 1)
+		self.assertEqual(snapshot['classes']['MonthsBasedRecurrence']['get_occurrence_after']['calls'], 1)
+		self.assertEqual(self.dbr, recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3))
+	
+	def testCallback(self):
+		events = []
+		instrumentation.enable(methods=('get_occurrence', ), callback=events.append)
+		instrumentation.tag(self.mbr, 'reminders')
+		self.mbr.get_occurrence(3)
+		self.mbr.is_occurrence(date(2012, 4, 27))
+		self.assertEqual(len(events), 1)
+		self.assertEqual(events[0]['class'], 'MonthsBasedRecurrence')
+		self.assertEqual(events[0]['tag'], 'reminders')
+		self.assertEqual(events[0]['method'], 'get_occurrence')
+		self.assertEqual(events[0]['arguments'], 'int')
+
+
+if __name__ == "__main__":
+	unittest.main()
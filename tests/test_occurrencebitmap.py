@@ -0,0 +1,92 @@
+import unittest
+from datetime import date, timedelta
+from yearmonth import YearMonth
+import recurrence
+
+try:
+	from occurrencebitmap import OccurrenceBitmap
+except ImportError:
+	OccurrenceBitmap = None
+
+
+class EveryOtherSunday(object):
+	
+	def occurrences_between(self, start, end):
+		day = start
+		while day < end:
+			if day.weekday() == recurrence.SUN and day.toordinal() % 14 < 7:
+				yield day
+			day += timedelta(days=1)
+
+
+@unittest.skipIf(OccurrenceBitmap is None, 'NumPy is not available')
+class TestOccurrenceBitmap(unittest.TestCase):
+	
+	def setUp(self):
+		self.start = date(2012, 1, 3)
+		self.end = date(2014, 7, 1)
+		self.every_3_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3)
+		self.every_5_days = recurrence.DaysBasedRecurrence(anchor=date(2011, 1, 1), period=5)
+		self.last_friday = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI)
+		self.seventh = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=7)
+		self.quarter_end = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=3, ordinal=-1)
+		self.other_sunday = EveryOtherSunday()
+		self.recurrences = [self.every_3_days, self.every_5_days, self.last_friday, self.seventh, self.quarter_end,
+				self.other_sunday]
+	
+	def dates(self, rc):
+		return set(rc.occurrences_between(self.start, self.end))
+	
+	def bitmap(self, rc):
+		return OccurrenceBitmap.from_recurrence(rc, self.start, self.end)
+	
+	def testFromRecurrence(self):
+		for rc in self.recurrences:
+			bitmap = self.bitmap(rc)
+			expected = sorted(self.dates(rc))
+			self.assertEqual(bitmap.to_dates(), expected)
+			self.assertEqual(bitmap.to_datetime64().tolist(), expected)
+			self.assertEqual(bitmap.count(), len(expected))
+			for day in expected:
+				self.assertTrue(day in bitmap)
+			self.assertFalse(self.end in bitmap)
+	
+	def testQuarterEndWindow(self):
+		rc = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2024, 1), period=3, ordinal=-1)
+		bitmap = OccurrenceBitmap.from_recurrence(rc, date(2024, 1, 1), date(2024, 3, 15))
+		self.assertEqual(bitmap.count(), 0)
+		bitmap = OccurrenceBitmap.from_recurrence(rc, date(2024, 2, 2), date(2025, 2, 2))
+		self.assertEqual(bitmap.to_dates(), [date(2024, 3, 31), date(2024, 6, 30), date(2024, 9, 30), date(2024, 12, 31)])
+	
+	def testUnion(self):
+		bitmaps = [self.bitmap(rc) for rc in self.recurrences]
+		expected = set()
+		for rc in self.recurrences:
+			expected |= self.dates(rc)
+		self.assertEqual(bitmaps[0].union(*bitmaps[1:]).to_dates(), sorted(expected))
+		self.assertEqual((bitmaps[0] | bitmaps[2]).to_dates(), sorted(self.dates(self.every_3_days) | self.dates(self.last_friday)))
+	
+	def testIntersection(self):
+		bitmap = self.bitmap(self.every_3_days) & self.bitmap(self.seventh)
+		self.assertEqual(bitmap.to_dates(), sorted(self.dates(self.every_3_days) & self.dates(self.seventh)))
+		bitmap = self.bitmap(self.every_3_days).intersection(self.bitmap(self.every_5_days), self.bitmap(self.other_sunday))
+		expected = self.dates(self.every_3_days) & self.dates(self.every_5_days) & self.dates(self.other_sunday)
+		self.assertEqual(bitmap.to_dates(), sorted(expected))
+	
+	def testDifference(self):
+		bitmap = self.bitmap(self.every_3_days) - self.bitmap(self.every_5_days)
+		self.assertEqual(bitmap.to_dates(), sorted(self.dates(self.every_3_days) - self.dates(self.every_5_days)))
+	
+	def testEmptyRange(self):
+		bitmap = OccurrenceBitmap.from_recurrence(self.every_3_days, self.start, self.start)
+		self.assertEqual(bitmap.to_dates(), [])
+		self.assertEqual(bitmap.count(), 0)
+	
+	def testIncompatibleRanges(self):
+		other = OccurrenceBitmap.from_recurrence(self.every_3_days, self.start, self.end - timedelta(days=1))
+		self.assertRaises(ValueError, lambda: self.bitmap(self.every_3_days) | other)
+		self.assertRaises(ValueError, lambda: OccurrenceBitmap(self.end, self.start))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from datetime import date
+from yearmonth import YearMonth
+from recurrenceset import RecurrenceSet
+import recurrence
+
+try:
+	import parallel
+except ImportError:
+	parallel = None
+
+
+class CountedDates(object):
+	# Occurrences without count_between, recording how often it is expanded
+	
+	def __init__(self, dates):
+		self.dates = dates
+		self.expansions = 0
+	
+	def occurrences_between(self, start, end):
+		self.expansions += 1
+		return iter([d for d in self.dates if start <= d < end])
+
+
+@unittest.skipIf(parallel is None, 'NumPy is not available')
+class TestExpandBetween(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = []
+		for offset in range(20):
+			self.recurrences.append(recurrence.DaysBasedRecurrence(date(2012, 1, 1 + offset), 1 + offset))
+			self.recurrences.append(recurrence.MonthsBasedRecurrence(YearMonth(2012, 1 + offset % 12), 1 + offset % 3, -1 - offset % 2, offset % 7))
+		self.recurrences.append(RecurrenceSet(dates=[date(2012, 6, 1), date(2014, 1, 1)]))
+		self.recurrences.append(recurrence.DaysBasedRecurrence(date(2030, 1, 1), 1))
+		self.start, self.end = date(2012, 3, 1), date(2013, 3, 1)
+	
+	def expected(self):
+		return [[index, occurrence.toordinal()]
+				for index, rc in enumerate(self.recurrences)
+				for occurrence in rc.occurrences_between(self.start, self.end)]
+	
+	def testSameOutputForAnyNumberOfProcesses(self):
+		expected = self.expected()
+		for processes in (1, 2, 3):
+			pairs = parallel.expand_between(self.recurrences, self.start, self.end, processes=processes)
+			self.assertEqual(pairs.shape, (len(expected), 2))
+			self.assertEqual(pairs.tolist(), expected)
+	
+	def testObjectsWithoutCountExpandedOnce(self):
+		counted = CountedDates([date(2012, 5, 1), date(2012, 6, 1), date(2014, 1, 1)])
+		pairs = parallel.expand_between([self.recurrences[0], counted], self.start, self.end, processes=1)
+		self.assertEqual(counted.expansions, 1)
+		self.assertEqual(pairs[pairs[:, 0] == 1, 1].tolist(), [date(2012, 5, 1).toordinal(), date(2012, 6, 1).toordinal()])
+	
+	def testEmpty(self):
+		self.assertEqual(parallel.expand_between([], self.start, self.end, processes=2).shape, (0, 2))
+		pairs = parallel.expand_between(self.recurrences, self.end, self.start, processes=2)
+		self.assertEqual(pairs.shape, (0, 2))
+
+
+if __name__ == "__main__":
+	unittest.main()
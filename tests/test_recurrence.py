@@ -1,8 +1,22 @@
 import unittest
-from datetime import date
-from itertools import izip, izip_longest
+import copy
+import itertools
+import pickle
+import threading
+from datetime import date, timedelta
+try:
+	from itertools import izip, izip_longest
+except ImportError:
+	izip = zip
+	from itertools import zip_longest as izip_longest
 from yearmonth import YearMonth
 import recurrence
+import recurrencereference
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
 class TestDaysBasedRecurrence(unittest.TestCase):
@@ -1146,6 +1160,463 @@ class TestMonthsBasedRecurrenceWithNegativeDayOfWeek(unittest.TestCase):
 				)
 
 
+class TestDaysBasedRecurrenceIntersect(unittest.TestCase):
+	
+	def assertIntersection(self, dbr1, dbr2):
+		start = min(dbr1.anchor, dbr2.anchor)
+		end = start + timedelta(days=3 * dbr1.period * dbr2.period)
+		common = sorted(set(dbr1.occurrences_between(start, end)) & set(dbr2.occurrences_between(start, end)))
+		intersection = dbr1.intersect(dbr2)
+		if not common:
+			self.assertIs(intersection, None)
+		else:
+			self.assertEqual(intersection.anchor, [d for d in common if d >= dbr1.anchor][0])
+			self.assertEqual(list(intersection.occurrences_between(start, end)), common)
+	
+	def testIntersect(self):
+		for period1, period2 in ((3, 5), (4, 6), (6, 4), (7, 7), (1, 9), (12, 18), (210, 330)):
+			for offset in range(-7, 8):
+				dbr1 = recurrence.DaysBasedRecurrence(date(2012, 4, 7), period1)
+				dbr2 = recurrence.DaysBasedRecurrence(date(2012, 4, 7) + timedelta(days=offset), period2)
+				self.assertIntersection(dbr1, dbr2)
+				self.assertIntersection(dbr2, dbr1)
+	
+	def testIntersectEmpty(self):
+		dbr1 = recurrence.DaysBasedRecurrence(date(2012, 4, 7), 4)
+		dbr2 = recurrence.DaysBasedRecurrence(date(2012, 4, 8), 6)
+		self.assertIs(dbr1.intersect(dbr2), None)
+	
+	def testIntersectLargePeriods(self):
+		dbr1 = recurrence.DaysBasedRecurrence(date(2012, 4, 7), 997)
+		dbr2 = recurrence.DaysBasedRecurrence(date(2012, 4, 8), 991)
+		intersection = dbr1.intersect(dbr2)
+		self.assertEqual(intersection.period, 997 * 991)
+		self.assertTrue(dbr1.is_occurrence(intersection.anchor))
+		self.assertTrue(dbr2.is_occurrence(intersection.anchor))
+	
+	def testIntersectInvalid(self):
+		dbr = recurrence.DaysBasedRecurrence(date(2012, 4, 7), 4)
+		mbr = recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 7)
+		self.assertRaises(ValueError, lambda: dbr.intersect(mbr))
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not available')
+class TestDaysBasedRecurrenceBatch(unittest.TestCase):
+	
+	def setUp(self):
+		self.dbr = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3)
+	
+	def assertMatchesScalar(self, numbers, occurrences):
+		self.assertEqual(occurrences.dtype, numpy.dtype('datetime64[D]'))
+		self.assertEqual(occurrences.shape, numpy.shape(numbers))
+		for number, occurrence in zip(numpy.ravel(numbers), occurrences.flat):
+			self.assertEqual(occurrence, numpy.datetime64(self.dbr.get_occurrence(int(number))))
+	
+	def testGetOccurrencesFromRange(self):
+		numbers = range(-9, 10)
+		self.assertMatchesScalar(numbers, self.dbr.get_occurrences(numbers))
+	
+	def testGetOccurrencesFromArray(self):
+		numbers = numpy.array([[5, -400, 0], [100000, 7, -1]])
+		self.assertMatchesScalar(numbers, self.dbr.get_occurrences(numbers))
+	
+	def testGetOccurrencesEmpty(self):
+		occurrences = self.dbr.get_occurrences([])
+		self.assertEqual(len(occurrences), 0)
+		self.assertEqual(occurrences.dtype, numpy.dtype('datetime64[D]'))
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not available')
+class TestMonthsBasedRecurrenceBatch(unittest.TestCase):
+	
+	DAYS = (recurrence.DAY_OF_PERIOD, ) + tuple(range(7))
+	
+	def assertMatchesScalar(self, mbr, numbers):
+		occurrences = mbr.get_occurrences(numbers)
+		self.assertEqual(occurrences.dtype, numpy.dtype('datetime64[D]'))
+		self.assertEqual(occurrences.shape, numpy.shape(numbers))
+		for number, occurrence in zip(numpy.ravel(numbers), occurrences.flat):
+			expected = mbr.get_occurrence(int(number))
+			self.assertEqual(occurrence, numpy.datetime64(expected),
+					'%r, number=%d: occurrence=%r, expected=%r' % (mbr.__dict__, number, occurrence, expected)
+				)
+	
+	def testGetOccurrencesMatchesScalar(self):
+		for period in (1, 2, 3, 12):
+			for ordinal in (1, 2, 5, 7, 28, 31, 40, -1, -2, -5, -40):
+				for day in self.DAYS:
+					mbr = recurrence.MonthsBasedRecurrence(YearMonth(2012, 1), period, ordinal, day)
+					self.assertMatchesScalar(mbr, range(-30, 30))
+	
+	def testGetOccurrencesFromArray(self):
+		mbr = recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 3, -1, recurrence.FRI)
+		self.assertMatchesScalar(mbr, numpy.array([[0, 1], [-1000, 2000]]))
+
+
+class TestOccurrencesBetween(unittest.TestCase):
+	
+	RECURRENCES = [
+		recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+		recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=1),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=7),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=2, ordinal=2, day=recurrence.TUE),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI),
+		# Occurrences after the first month of the period
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=3, ordinal=-1),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 2), period=2, ordinal=45),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=3, ordinal=6, day=recurrence.WED),
+		# Occurrences spilling out of their period
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=5, day=recurrence.MON),
+		recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 1), period=1, ordinal=12, day=recurrence.MON),
+	]
+	
+	def expected(self, rc, start, end):
+		occurrences = rc.generate(first_occurrence_number=-200)
+		return [occurrence for occurrence in itertools.takewhile(lambda d: d < end, occurrences) if occurrence >= start]
+	
+	def testOccurrencesBetween(self):
+		for rc in self.RECURRENCES:
+			for start, end in [
+					(date(2012, 4, 7), date(2012, 7, 7)),
+					(date(2012, 4, 8), date(2013, 1, 1)),
+					(date(2011, 12, 31), date(2012, 12, 31)),
+					(date(2013, 5, 1), date(2013, 5, 1)),
+					(date(2013, 5, 1), date(2012, 5, 1)),
+				]:
+				self.assertEqual(list(rc.occurrences_between(start, end)), self.expected(rc, start, end),
+						'%r: start=%r, end=%r' % (rc.__dict__, start, end)
+					)
+	
+	def testQuarterEnd(self):
+		rc = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2024, 1), period=3, ordinal=-1)
+		self.assertEqual(list(rc.occurrences_between(date(2024, 2, 2), date(2025, 2, 2))),
+				[date(2024, 3, 31), date(2024, 6, 30), date(2024, 9, 30), date(2024, 12, 31)]
+			)
+		self.assertEqual(list(rc.occurrences_between(date(2024, 2, 1), date(2024, 3, 15))), [])
+		self.assertEqual(rc.get_occurrence_after(date(2024, 2, 1)), date(2024, 3, 31))
+		self.assertTrue(rc.is_occurrence(date(2024, 3, 31)))
+		self.assertEqual(rc.get_occurrence_number(date(2024, 3, 31)), 0)
+	
+	def testCountAndNthAfterQuarterEnd(self):
+		rc = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2024, 1), period=3, ordinal=-1)
+		self.assertEqual(rc.count_between(date(2024, 2, 2), date(2024, 4, 15)), 1)
+		self.assertEqual(rc.count_between(date(2024, 2, 1), date(2024, 3, 15)), 0)
+		self.assertEqual(rc.count_between(date(2024, 3, 31), date(2025, 3, 31)), 4)
+		self.assertEqual(rc.nth_after(date(2024, 2, 1), 1), date(2024, 3, 31))
+		self.assertEqual(rc.nth_after(date(2024, 2, 1), 3), date(2024, 9, 30))
+		self.assertEqual(rc.nth_after(date(2024, 3, 31), 1), date(2024, 6, 30))
+	
+	def testBruteForce(self):
+		# Every window of a few weeks, against the expansion of the recurrence
+		for rc in self.RECURRENCES:
+			occurrences = list(itertools.takewhile(lambda d: d < date(2015, 1, 1), rc.generate(first_occurrence_number=-100)))
+			for offset in range(0, 700, 5):
+				start = date(2012, 1, 1) + timedelta(days=offset)
+				end = start + timedelta(days=offset % 40)
+				self.assertEqual(list(rc.occurrences_between(start, end)),
+						[occurrence for occurrence in occurrences if start <= occurrence < end],
+						'%r: start=%r, end=%r' % (rc.__dict__, start, end)
+					)
+				self.assertEqual(rc.get_occurrence_after(start), [o for o in occurrences if o > start][0])
+				self.assertEqual(rc.get_occurrence_before(start), [o for o in occurrences if o < start][-1])
+				self.assertEqual(rc.is_occurrence(start), start in occurrences)
+	
+	def testGenerateAfterMatchesGetOccurrenceAfter(self):
+		for rc in self.RECURRENCES:
+			occurrence = date(2012, 1, 15)
+			for generated in itertools.islice(rc.generate_after(occurrence), 30):
+				occurrence = rc.get_occurrence_after(occurrence)
+				self.assertEqual(generated, occurrence)
+	
+	def testCountBetween(self):
+		for rc in self.RECURRENCES:
+			for start, end in [
+					(date(2012, 4, 7), date(2012, 7, 7)),
+					(date(2011, 12, 31), date(2022, 12, 31)),
+					(date(2013, 5, 1), date(2013, 5, 1)),
+					(date(2013, 5, 1), date(2012, 5, 1)),
+				]:
+				self.assertEqual(rc.count_between(start, end), len(self.expected(rc, start, end)))
+	
+	def testNthAfter(self):
+		for rc in self.RECURRENCES:
+			after = date(2012, 6, 30)
+			expected = list(itertools.islice(rc.generate_after(after), 50))
+			for k in (1, 2, 17, 50):
+				self.assertEqual(rc.nth_after(after, k), expected[k - 1])
+			self.assertRaises(ValueError, lambda: rc.nth_after(after, 0))
+	
+	def testGetOccurrenceBefore(self):
+		for rc in self.RECURRENCES:
+			occurrences = list(rc.occurrences_between(date(2011, 1, 1), date(2015, 1, 1)))
+			for offset in range(0, 1000, 3):
+				before = date(2011, 6, 1) + timedelta(days=offset)
+				expected = [occurrence for occurrence in occurrences if occurrence < before][-1]
+				self.assertEqual(rc.get_occurrence_before(before), expected, '%r: %r' % (rc.__dict__, before))
+	
+	def testGenerateBefore(self):
+		for rc in self.RECURRENCES:
+			before, after = date(2013, 2, 1), date(2012, 4, 7)
+			expected = list(reversed([occurrence for occurrence in rc.occurrences_between(after, before) if occurrence > after]))
+			self.assertEqual(list(rc.generate_before(before, after=after)), expected)
+			self.assertEqual(list(itertools.islice(rc.generate_before(before), len(expected))), expected)
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testGetOccurrencesBetween(self):
+		for rc in self.RECURRENCES:
+			start, end = date(2011, 12, 31), date(2014, 2, 1)
+			occurrences = rc.get_occurrences_between(start, end)
+			self.assertEqual(occurrences.dtype, numpy.dtype('datetime64[D]'))
+			self.assertEqual(occurrences.tolist(), self.expected(rc, start, end))
+
+
+class TestMonthsBasedRecurrenceCache(unittest.TestCase):
+	
+	def setUp(self):
+		self.mbr = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI, cache_size=3)
+		self.uncached = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI)
+	
+	def testDisabledByDefault(self):
+		self.assertIs(self.uncached.cache_info(), None)
+		self.assertRaises(ValueError, lambda: recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, 1, cache_size=0))
+	
+	def testResults(self):
+		for number in list(range(-10, 10)) * 2:
+			self.assertEqual(self.mbr.get_occurrence(number), self.uncached.get_occurrence(number))
+		self.assertTrue(self.mbr == self.uncached)
+	
+	def testPickleAndCopy(self):
+		self.mbr.get_occurrence(0)
+		for copied in (pickle.loads(pickle.dumps(self.mbr)), copy.deepcopy(self.mbr), copy.copy(self.mbr)):
+			self.assertEqual(copied, self.mbr)
+			self.assertEqual(copied.get_occurrence(2), self.uncached.get_occurrence(2))
+		copied = pickle.loads(pickle.dumps(self.mbr))
+		self.assertEqual(copied.cache_info(), recurrence.CacheInfo(hits=0, misses=0, maxsize=3, currsize=0))
+	
+	def testHitsAndMisses(self):
+		self.mbr.is_occurrence(date(2012, 4, 27))
+		self.mbr.get_occurrence_number(date(2012, 4, 27))
+		self.mbr.get_occurrence_after(date(2012, 4, 26))
+		# Each lookup searches April and March, then evaluates April again
+		self.assertEqual(self.mbr.cache_info(), recurrence.CacheInfo(hits=7, misses=2, maxsize=3, currsize=2))
+		
+		self.mbr.cache_clear()
+		self.assertEqual(self.mbr.cache_info(), recurrence.CacheInfo(hits=0, misses=0, maxsize=3, currsize=0))
+	
+	def testLeastRecentlyUsedEviction(self):
+		for number in (0, 1, 2, 0, 3):
+			self.mbr.get_occurrence(number)
+		self.assertEqual(self.mbr.cache_info(), recurrence.CacheInfo(hits=1, misses=4, maxsize=3, currsize=3))
+		self.mbr.get_occurrence(0)
+		self.mbr.get_occurrence(1)
+		self.assertEqual(self.mbr.cache_info(), recurrence.CacheInfo(hits=2, misses=5, maxsize=3, currsize=3))
+	
+	def testThreads(self):
+		expected = [self.uncached.get_occurrence(number) for number in range(20)]
+		results = []
+		def worker():
+			results.append([self.mbr.get_occurrence(number) for number in range(20)])
+		threads = [threading.Thread(target=worker) for _ in range(8)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(results, [expected] * 8)
+		info = self.mbr.cache_info()
+		self.assertEqual(info.hits + info.misses, 8 * 20)
+		self.assertEqual(info.currsize, 3)
+
+
+class TestMonthsBasedRecurrenceEvaluator(unittest.TestCase):
+	
+	def testMatchesGenericPath(self):
+		for day in (recurrence.DAY_OF_PERIOD, recurrence.MON, recurrence.THU, recurrence.SUN):
+			for ordinal in (-40, -5, -1, 0, 1, 2, 5, 29, 31, 40, 70):
+				for period in (1, 2, 3, 12):
+					rc = recurrence.MonthsBasedRecurrence(YearMonth(2011, 11), period, ordinal, day)
+					for month_ordinal in range(YearMonth(2011, 1).to_ordinal(), YearMonth(2014, 1).to_ordinal()):
+						self.assertEqual(rc._evaluator(rc, month_ordinal), recurrencereference.day_for_month_ordinal(rc, month_ordinal),
+								'%r: %r' % (rc.__dict__, YearMonth.from_ordinal(month_ordinal))
+							)
+	
+	def testPickle(self):
+		rc = recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), 1, -1, recurrence.FRI)
+		copy = pickle.loads(pickle.dumps(rc))
+		self.assertEqual(copy, rc)
+		self.assertEqual(copy.get_occurrence(3), rc.get_occurrence(3))
+
+
+class TestMergeAfter(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = [
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 1), period=10),
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1),
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=2, ordinal=2, day=recurrence.TUE),
+		]
+	
+	def testMergeAfter(self):
+		after, before = date(2012, 4, 7), date(2013, 4, 7)
+		expected = []
+		for index, rc in enumerate(self.recurrences):
+			expected.extend((occurrence, index) for occurrence in rc.generate_after(after, before))
+		expected.sort()
+		
+		merged = [(occurrence, index_of(self.recurrences, rc))
+				for occurrence, rc in recurrence.merge_after(self.recurrences, after, before)]
+		self.assertEqual(merged, expected)
+	
+	def testMergeAfterIsLazy(self):
+		merged = recurrence.merge_after(iter(self.recurrences), date(2012, 4, 7))
+		first = list(itertools.islice(merged, 5))
+		self.assertEqual([occurrence for occurrence, _ in first],
+				[date(2012, 4, 10), date(2012, 4, 10), date(2012, 4, 10), date(2012, 4, 11), date(2012, 4, 13)]
+			)
+		self.assertIs(first[0][1], self.recurrences[0])
+		self.assertIs(first[1][1], self.recurrences[1])
+		self.assertIs(first[2][1], self.recurrences[4])
+	
+	def testMergeAfterEmpty(self):
+		self.assertEqual(list(recurrence.merge_after([], date(2012, 4, 7))), [])
+
+
+def index_of(recurrences, rc):
+	for index, candidate in enumerate(recurrences):
+		if candidate is rc:
+			return index
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not available')
+class TestOccurrenceArrays(unittest.TestCase):
+	
+	RECURRENCES = [
+		recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+		recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=1),
+	] + [
+		recurrence.MonthsBasedRecurrence(YearMonth(2012, 4), period, ordinal, day)
+		for period in (1, 2, 3)
+		for ordinal in (1, 7, 31, 40, -1, -3)
+		for day in (recurrence.DAY_OF_PERIOD, recurrence.MON, recurrence.SAT)
+	]
+	
+	def setUp(self):
+		self.candidates = numpy.arange('2011-11-01', '2013-02-01', dtype='datetime64[D]')
+	
+	def testAreOccurrences(self):
+		for rc in self.RECURRENCES:
+			mask = rc.are_occurrences(self.candidates)
+			self.assertEqual(mask.dtype, numpy.dtype(bool))
+			expected = [rc.is_occurrence(candidate) for candidate in self.candidates.tolist()]
+			self.assertEqual(mask.tolist(), expected, repr(rc.__dict__))
+	
+	def testGetOccurrenceNumbers(self):
+		for rc in self.RECURRENCES:
+			numbers = rc.get_occurrence_numbers(self.candidates)
+			self.assertEqual(numbers.dtype, numpy.dtype(numpy.int64))
+			for candidate, number in zip(self.candidates.tolist(), numbers.tolist()):
+				try:
+					expected = rc.get_occurrence_number(candidate)
+				except ValueError:
+					expected = recurrence.NO_OCCURRENCE
+				self.assertEqual(number, expected, '%r: %r' % (rc.__dict__, candidate))
+	
+	def testAcceptsDates(self):
+		dbr = self.RECURRENCES[0]
+		candidates = [[date(2012, 4, 10), date(2012, 4, 11)], [date(2011, 4, 8), date(2012, 4, 7)]]
+		self.assertEqual(dbr.are_occurrences(candidates).tolist(), [[True, False], [False, True]])
+		self.assertEqual(dbr.get_occurrence_numbers(candidates).tolist(),
+				[[1, recurrence.NO_OCCURRENCE], [recurrence.NO_OCCURRENCE, 0]]
+			)
+	
+	def testGenericFallback(self):
+		dbr = self.RECURRENCES[0]
+		self.assertEqual(recurrence.Recurrence.are_occurrences(dbr, self.candidates).tolist(),
+				dbr.are_occurrences(self.candidates).tolist()
+			)
+		self.assertEqual(recurrence.Recurrence.get_occurrence_numbers(dbr, self.candidates).tolist(),
+				dbr.get_occurrence_numbers(self.candidates).tolist()
+			)
+
+
+class TestRecurrenceCursor(unittest.TestCase):
+	
+	RECURRENCES = TestOccurrencesBetween.RECURRENCES
+	
+	def testNextAndPrev(self):
+		for rc in self.RECURRENCES:
+			cursor = recurrence.RecurrenceCursor(rc, number=-3)
+			self.assertEqual(cursor.occurrence, rc.get_occurrence(-3))
+			for number in range(-2, 10):
+				self.assertEqual(cursor.next(), rc.get_occurrence(number))
+				self.assertEqual(cursor.number, number)
+			for number in range(8, -5, -1):
+				self.assertEqual(cursor.prev(), rc.get_occurrence(number))
+				self.assertEqual(cursor.number, number)
+	
+	def testSeekMonotonic(self):
+		for rc in self.RECURRENCES:
+			cursor = recurrence.RecurrenceCursor(rc)
+			for offset in range(0, 800, 2):
+				now = date(2012, 1, 1) + timedelta(days=offset)
+				expected = rc.get_occurrence_after(now)
+				self.assertEqual(cursor.seek(now), expected)
+				self.assertEqual(cursor.occurrence, expected)
+				self.assertEqual(rc.get_occurrence(cursor.number), expected)
+	
+	def testSeekBackwardsAndFar(self):
+		for rc in self.RECURRENCES:
+			cursor = recurrence.RecurrenceCursor(rc, max_steps=2)
+			for now in (date(2012, 5, 1), date(2012, 4, 20), date(2030, 1, 1), date(2012, 4, 20), date(1990, 12, 31)):
+				self.assertEqual(cursor.seek(now), rc.get_occurrence_after(now))
+				self.assertEqual(rc.get_occurrence(cursor.number), cursor.occurrence)
+	
+	def testSeekSpillingFromAnyStart(self):
+		quarter_end = recurrence.MonthsBasedRecurrence(YearMonth(2024, 1), 3, -1)
+		fifth_monday = recurrence.MonthsBasedRecurrence(YearMonth(2024, 1), 1, 5, recurrence.MON)
+		for rc, now, expected in [
+				(quarter_end, date(2024, 2, 1), date(2024, 3, 31)),
+				(quarter_end, date(2024, 3, 31), date(2024, 6, 30)),
+				(fifth_monday, date(2024, 2, 1), date(2024, 3, 4)),
+				(fifth_monday, date(2024, 3, 4), date(2024, 4, 1)),
+			]:
+			for number in (0, 1, 40, -40):
+				cursor = recurrence.RecurrenceCursor(rc, number=number)
+				self.assertEqual(cursor.seek(now), expected)
+				self.assertEqual(rc.get_occurrence(cursor.number), expected)
+
+
+
+class TestOrdinalMethods(unittest.TestCase):
+	
+	RECURRENCES = TestOccurrencesBetween.RECURRENCES
+	
+	def testGetOccurrenceOrdinal(self):
+		for rc in self.RECURRENCES:
+			for number in range(-30, 30):
+				self.assertEqual(rc.get_occurrence_ordinal(number), rc.get_occurrence(number).toordinal())
+	
+	def testIsOccurrenceAndGetOccurrenceAfterOrdinal(self):
+		for rc in self.RECURRENCES:
+			for offset in range(-400, 400):
+				candidate = date(2012, 4, 7) + timedelta(days=offset)
+				day_ordinal = candidate.toordinal()
+				self.assertEqual(rc.is_occurrence_ordinal(day_ordinal), rc.is_occurrence(candidate))
+				self.assertEqual(rc.get_occurrence_after_ordinal(day_ordinal),
+						rc.get_occurrence_after(candidate).toordinal()
+					)
+	
+	def testFromFields(self):
+		for rc in self.RECURRENCES:
+			if isinstance(rc, recurrence.DaysBasedRecurrence):
+				copy = recurrence.DaysBasedRecurrence._from_fields(rc.anchor, rc.period)
+			else:
+				copy = recurrence.MonthsBasedRecurrence._from_fields(rc.anchor, rc.period, rc.ordinal, rc.day)
+			self.assertEqual(copy.get_occurrence_ordinal(5), rc.get_occurrence_ordinal(5))
+
+
 
 if __name__ == "__main__":
 	#import sys;sys.argv = ['', 'Test.testName']
@@ -0,0 +1,72 @@
+import unittest
+from datetime import date, timedelta
+from yearmonth import YearMonth
+from recurrenceindex import RecurrenceIndex
+import recurrence
+
+
+class EveryOtherSunday(object):
+	
+	def is_occurrence(self, candidate):
+		return candidate.weekday() == recurrence.SUN and candidate.toordinal() % 14 < 7
+
+
+class TestRecurrenceIndex(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = []
+		for period in (1, 3, 7, 10):
+			for offset in range(4):
+				self.recurrences.append(recurrence.DaysBasedRecurrence(date(2012, 4, 7 + offset), period))
+		for period in (1, 2, 3, 12):
+			for month in (1, 2, 5):
+				for ordinal, day in ((1, recurrence.DAY_OF_PERIOD), (31, recurrence.DAY_OF_PERIOD), (-1, recurrence.DAY_OF_PERIOD),
+						(2, recurrence.TUE), (-1, recurrence.FRI), (45, recurrence.DAY_OF_PERIOD), (5, recurrence.MON)):
+					self.recurrences.append(recurrence.MonthsBasedRecurrence(YearMonth(2012, month), period, ordinal, day))
+		self.recurrences.append(EveryOtherSunday())
+		self.index = RecurrenceIndex(self.recurrences)
+	
+	def assertLookupsMatch(self, recurrences):
+		for offset in range(400):
+			day = date(2012, 1, 1) + timedelta(days=offset)
+			expected = set(id(rc) for rc in recurrences if rc.is_occurrence(day))
+			found = [id(rc) for rc in self.index.get_recurrences_on(day)]
+			self.assertEqual(len(found), len(set(found)))
+			self.assertEqual(set(found), expected, 'day=%r' % day)
+	
+	def testGetRecurrencesOn(self):
+		self.assertEqual(len(self.index), len(self.recurrences))
+		self.assertLookupsMatch(self.recurrences)
+	
+	def testRemove(self):
+		removed = self.recurrences[::3]
+		kept = [rc for rc in self.recurrences if rc not in removed]
+		for rc in removed:
+			self.index.remove(rc)
+		self.assertEqual(len(self.index), len(kept))
+		self.assertLookupsMatch(kept)
+		for rc in removed:
+			self.assertFalse(rc in self.index)
+			self.assertRaises(KeyError, self.index.remove, rc)
+	
+	def testEqualInstancesAreKeptApart(self):
+		index = RecurrenceIndex()
+		first = recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3)
+		second = recurrence.DaysBasedRecurrence(date(2012, 4, 7), 3)
+		index.add(first)
+		index.add(second)
+		index.add(first)
+		self.assertEqual(len(index), 2)
+		self.assertEqual(len(index.get_recurrences_on(date(2012, 4, 10))), 2)
+		
+		index.remove(first)
+		self.assertEqual(index.get_recurrences_on(date(2012, 4, 10)), [second])
+		self.assertEqual(list(index), [second])
+		
+		index.remove(second)
+		self.assertEqual(index.get_recurrences_on(date(2012, 4, 10)), [])
+		self.assertEqual(index._days_based, {})
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import itertools
+from datetime import date, timedelta
+from yearmonth import YearMonth
+from recurrenceset import RecurrenceSet
+import recurrence
+
+
+class TestRecurrenceSet(unittest.TestCase):
+	
+	def setUp(self):
+		self.every_3_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3)
+		self.every_5_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=5)
+		self.fifteenth = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=15)
+		self.extra_dates = [date(2012, 4, 8), date(2012, 5, 1), date(2012, 4, 8), date(2013, 1, 2)]
+		self.exdates = [date(2012, 4, 13), date(2012, 6, 15), date(2012, 4, 20)]
+		self.rs = RecurrenceSet(
+				recurrences=[self.every_3_days, self.fifteenth],
+				dates=self.extra_dates,
+				exclusions=[self.every_5_days],
+				exdates=self.exdates,
+			)
+		self.start = date(2012, 1, 1)
+		self.end = date(2013, 6, 1)
+	
+	def expected(self, start, end):
+		included = set(self.every_3_days.occurrences_between(start, end))
+		included |= set(self.fifteenth.occurrences_between(start, end))
+		included |= set(d for d in self.extra_dates if start <= d < end)
+		excluded = set(self.every_5_days.occurrences_between(start, end)) | set(self.exdates)
+		return sorted(included - excluded)
+	
+	def testIsOccurrence(self):
+		expected = set(self.expected(self.start, self.end))
+		day = self.start
+		while day < self.end:
+			self.assertEqual(self.rs.is_occurrence(day), day in expected, 'day=%r' % day)
+			day += timedelta(days=1)
+	
+	def testOccurrencesBetween(self):
+		self.assertEqual(list(self.rs.occurrences_between(self.start, self.end)), self.expected(self.start, self.end))
+		self.assertEqual(list(self.rs.occurrences_between(date(2012, 4, 8), date(2012, 4, 22))),
+				[date(2012, 4, 8), date(2012, 4, 10), date(2012, 4, 15), date(2012, 4, 16), date(2012, 4, 19)]
+			)
+	
+	def testGenerateAfter(self):
+		after = date(2012, 4, 8)
+		expected = self.expected(after + timedelta(days=1), self.end)
+		self.assertEqual(list(self.rs.generate_after(after, before=self.end)), expected)
+		self.assertEqual(list(itertools.islice(self.rs.generate_after(after), len(expected))), expected)
+	
+	def testGetOccurrenceAfter(self):
+		occurrence = date(2012, 3, 31)
+		expected = self.expected(date(2012, 4, 1), self.end)
+		for expected_occurrence in expected:
+			occurrence = self.rs.get_occurrence_after(occurrence)
+			self.assertEqual(occurrence, expected_occurrence)
+	
+	def testOnlyDates(self):
+		rs = RecurrenceSet(dates=self.extra_dates, exdates=[date(2012, 5, 1)])
+		self.assertEqual(rs.get_occurrence_after(date(2012, 4, 8)), date(2013, 1, 2))
+		self.assertIs(rs.get_occurrence_after(date(2013, 1, 2)), None)
+		self.assertEqual(list(rs.generate_after(date(2012, 1, 1))), [date(2012, 4, 8), date(2013, 1, 2)])
+	
+	def testNested(self):
+		outer = RecurrenceSet(recurrences=[self.rs], exdates=[date(2012, 4, 10)])
+		expected = [d for d in self.expected(self.start, self.end) if d != date(2012, 4, 10)]
+		self.assertEqual(list(outer.occurrences_between(self.start, self.end)), expected)
+		self.assertEqual(outer.get_occurrence_after(date(2012, 4, 8)), date(2012, 4, 15))
+		self.assertFalse(outer.is_occurrence(date(2012, 4, 10)))
+		self.assertTrue(outer.is_occurrence(date(2012, 4, 15)))
+	
+	def testMergeAfter(self):
+		merged = recurrence.merge_after([self.rs, self.every_5_days], date(2012, 4, 7), before=date(2012, 4, 18))
+		self.assertEqual([(d, rc is self.rs) for d, rc in merged], [
+				(date(2012, 4, 8), True),
+				(date(2012, 4, 10), True),
+				(date(2012, 4, 12), False),
+				(date(2012, 4, 15), True),
+				(date(2012, 4, 16), True),
+				(date(2012, 4, 17), False),
+			])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import itertools
+from datetime import date, timedelta
+from yearmonth import YearMonth
+import recurrence
+
+try:
+	import numpy
+	from recurrencetable import RecurrenceTable
+except ImportError:
+	numpy = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not available')
+class TestRecurrenceTable(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = []
+		for period in (1, 3, 10):
+			for offset in (0, 1, 5):
+				self.recurrences.append(recurrence.DaysBasedRecurrence(date(2012, 4, 7 + offset), period))
+		for period in (1, 2, 3, 12):
+			for month in (1, 5):
+				for ordinal, day in ((1, recurrence.DAY_OF_PERIOD), (31, recurrence.DAY_OF_PERIOD), (-1, recurrence.DAY_OF_PERIOD),
+						(-3, recurrence.DAY_OF_PERIOD), (2, recurrence.TUE), (-1, recurrence.FRI), (5, recurrence.SUN)):
+					self.recurrences.append(recurrence.MonthsBasedRecurrence(YearMonth(2012, month), period, ordinal, day))
+		self.table = RecurrenceTable.from_recurrences(self.recurrences)
+		self.dates = [date(2011, 11, 1) + timedelta(days=offset) for offset in range(0, 500, 7)]
+	
+	def testColumns(self):
+		self.assertEqual(len(self.table), len(self.recurrences))
+		for row, rc in enumerate(self.recurrences):
+			self.assertEqual(self.table.get_recurrence(row), rc)
+	
+	def testNextAfter(self):
+		for day in self.dates:
+			expected = [rc.get_occurrence_after(day) for rc in self.recurrences]
+			self.assertEqual(self.table.next_after(day).tolist(), expected, 'day=%r' % day)
+	
+	def testIsOccurrence(self):
+		for offset in range(400):
+			day = date(2011, 11, 1) + timedelta(days=offset)
+			expected = [rc.is_occurrence(day) for rc in self.recurrences]
+			self.assertEqual(self.table.is_occurrence(day).tolist(), expected, 'day=%r' % day)
+	
+	def testOccurrencesBetween(self):
+		start, end = date(2012, 2, 10), date(2013, 7, 1)
+		rows, occurrences = self.table.occurrences_between(start, end)
+		expected_rows = []
+		expected_occurrences = []
+		for row, rc in enumerate(self.recurrences):
+			for occurrence in rc.occurrences_between(start, end):
+				expected_rows.append(row)
+				expected_occurrences.append(occurrence)
+		self.assertEqual(rows.tolist(), expected_rows)
+		self.assertEqual(occurrences.tolist(), expected_occurrences)
+		
+		rows, occurrences = self.table.occurrences_between(end, start)
+		self.assertEqual(len(rows), 0)
+		self.assertEqual(len(occurrences), 0)
+	
+	def testOccurrencesInsideWindow(self):
+		# Checked against the expansion of each recurrence rather than against
+		# its own range query
+		for start, end in ((date(2012, 2, 2), date(2013, 2, 2)), (date(2012, 2, 1), date(2012, 3, 15))):
+			rows, occurrences = self.table.occurrences_between(start, end)
+			for row, rc in enumerate(self.recurrences):
+				generated = itertools.takewhile(lambda d: d < end, rc.generate(first_occurrence_number=-500))
+				expected = [occurrence for occurrence in generated if occurrence >= start]
+				self.assertEqual(occurrences[rows == row].tolist(), expected, '%r' % rc.__dict__)
+		
+		quarter_end = RecurrenceTable.from_recurrences([recurrence.MonthsBasedRecurrence(YearMonth(2024, 1), 3, -1)])
+		_, occurrences = quarter_end.occurrences_between(date(2024, 2, 2), date(2025, 2, 2))
+		self.assertEqual(occurrences.tolist(), [date(2024, 3, 31), date(2024, 6, 30), date(2024, 9, 30), date(2024, 12, 31)])
+	
+	def testEmptyTable(self):
+		table = RecurrenceTable.from_recurrences([])
+		self.assertEqual(table.next_after(date(2012, 1, 1)).tolist(), [])
+		self.assertEqual(table.is_occurrence(date(2012, 1, 1)).tolist(), [])
+	
+	def testInvalidColumns(self):
+		self.assertRaises(ValueError, RecurrenceTable, [1, 2], [0, 0], [1, 1], [0, 0], [0])
+		self.assertRaises(ValueError, RecurrenceTable, [3], [0], [1], [0], [0])
+		self.assertRaises(ValueError, RecurrenceTable.from_recurrences, [object()])
+
+
+if __name__ == "__main__":
+	unittest.main()
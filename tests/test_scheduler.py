@@ -0,0 +1,181 @@
+import unittest
+from datetime import date, datetime, time, timedelta
+from yearmonth import YearMonth
+from recurrenceset import RecurrenceSet
+import recurrence
+
+try:
+	import asyncio
+	import scheduler
+except (ImportError, SyntaxError):
+	scheduler = None
+
+
+class FakeClock(object):
+	# Virtual time: sleeping advances the clock instead of waiting
+	
+	def __init__(self, now):
+		self.now = now
+		self.sleeps = []
+	
+	def __call__(self):
+		return self.now
+	
+	def sleep(self, seconds):
+		self.sleeps.append(seconds)
+		self.now += timedelta(seconds=seconds)
+		return asyncio.sleep(0)
+
+
+@unittest.skipIf(scheduler is None, 'asyncio is not available')
+class TestScheduler(unittest.TestCase):
+	
+	def setUp(self):
+		self.loop = asyncio.new_event_loop()
+		self.clock = FakeClock(datetime(2012, 4, 7, 12, 0))
+		self.scheduler = scheduler.Scheduler(clock=self.clock, sleep=self.clock.sleep)
+		self.fired = []
+		self.every_3_days = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3)
+		self.last_friday = recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI)
+	
+	def tearDown(self):
+		self.loop.close()
+	
+	def callback(self, limit):
+		def record(occurrence, rc):
+			self.fired.append((occurrence, rc, self.clock.now))
+			if len(self.fired) >= limit:
+				self.scheduler.stop()
+		return record
+	
+	def run_scheduler(self):
+		self.loop.run_until_complete(asyncio.wait_for(self.scheduler.run(), 5))
+	
+	def testFiresInOrder(self):
+		self.scheduler.add(self.every_3_days, self.callback(6))
+		self.scheduler.add(self.last_friday, self.callback(6))
+		self.assertEqual(len(self.scheduler), 2)
+		self.run_scheduler()
+		self.assertEqual([(occurrence, rc is self.every_3_days) for occurrence, rc, _ in self.fired], [
+				(date(2012, 4, 7), True),
+				(date(2012, 4, 10), True),
+				(date(2012, 4, 13), True),
+				(date(2012, 4, 16), True),
+				(date(2012, 4, 19), True),
+				(date(2012, 4, 22), True),
+			])
+		self.assertEqual(self.fired[0][2], datetime(2012, 4, 7, 12, 0))
+		self.assertEqual(self.fired[1][2], datetime(2012, 4, 10))
+		self.assertEqual(self.scheduler.get_next_fire_time(), datetime(2012, 4, 25))
+	
+	def testAfterAndTimeOfDay(self):
+		self.scheduler = scheduler.Scheduler(clock=self.clock, sleep=self.clock.sleep, time_of_day=time(9, 30))
+		self.scheduler.add(self.last_friday, self.callback(2), after=date(2012, 4, 7))
+		self.run_scheduler()
+		self.assertEqual([(occurrence, now) for occurrence, _, now in self.fired], [
+				(date(2012, 4, 27), datetime(2012, 4, 27, 9, 30)),
+				(date(2012, 5, 25), datetime(2012, 5, 25, 9, 30)),
+			])
+	
+	def testRemove(self):
+		schedule = self.scheduler.add(self.every_3_days, self.callback(3))
+		self.scheduler.add(self.last_friday, self.callback(3))
+		def remove_every_3_days(occurrence, rc):
+			self.scheduler.remove(schedule)
+		self.scheduler.add(recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 8), period=100), remove_every_3_days)
+		self.run_scheduler()
+		self.assertEqual([occurrence for occurrence, _, _ in self.fired],
+				[date(2012, 4, 7), date(2012, 4, 27), date(2012, 5, 25)]
+			)
+		self.assertEqual(len(self.scheduler), 2)
+		self.assertRaises(ValueError, self.scheduler.remove, schedule)
+	
+	def testRemovedSchedulesDoNotAccumulate(self):
+		kept = self.scheduler.add(self.last_friday, self.callback(1))
+		for offset in range(100):
+			rc = recurrence.DaysBasedRecurrence(anchor=date(2012, 5, 1) + timedelta(days=offset), period=7)
+			self.scheduler.remove(self.scheduler.add(rc, self.callback(1)))
+			self.assertLessEqual(len(self.scheduler._heap), 2 * len(self.scheduler))
+		self.assertEqual(len(self.scheduler), 1)
+		self.assertEqual(self.scheduler.get_next_fire_time(), datetime(2012, 4, 27))
+		self.run_scheduler()
+		self.assertEqual([occurrence for occurrence, _, _ in self.fired], [date(2012, 4, 27)])
+		self.assertFalse(kept.cancelled)
+	
+	def testFiniteRecurrence(self):
+		dates = RecurrenceSet(dates=[date(2012, 4, 9), date(2012, 4, 11)])
+		self.scheduler.add(dates, self.callback(10))
+		self.scheduler.add(RecurrenceSet(), self.callback(10))
+		self.assertEqual(len(self.scheduler), 1)
+		stopper = recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 30), period=30)
+		self.scheduler.add(stopper, lambda occurrence, rc: self.scheduler.stop())
+		self.run_scheduler()
+		self.assertEqual([occurrence for occurrence, _, _ in self.fired], [date(2012, 4, 9), date(2012, 4, 11)])
+		self.assertEqual(len(self.scheduler), 1)
+	
+	def testAddWakesIdleScheduler(self):
+		self.loop.call_later(0.01, self.scheduler.add, self.every_3_days, self.callback(2))
+		self.run_scheduler()
+		self.assertEqual([occurrence for occurrence, _, _ in self.fired], [date(2012, 4, 7), date(2012, 4, 10)])
+	
+	def testAddEarlierScheduleWakesSleep(self):
+		clock = self.clock
+		pending = []
+		def sleep(seconds):
+			clock.sleeps.append(seconds)
+			future = self.loop.create_future()
+			pending.append(future)
+			return future
+		self.scheduler = scheduler.Scheduler(clock=clock, sleep=sleep)
+		self.scheduler.add(self.last_friday, self.callback(1))
+		self.loop.call_later(0.01, self.scheduler.add, self.every_3_days, self.callback(1))
+		self.run_scheduler()
+		self.assertEqual([occurrence for occurrence, _, _ in self.fired], [date(2012, 4, 7)])
+		self.assertTrue(pending[0].cancelled())
+	
+	def testCoroutineCallbacks(self):
+		calls = []
+		def callback(occurrence, rc):
+			calls.append(occurrence)
+			self.scheduler.stop()
+			return asyncio.sleep(0)
+		self.scheduler.add(self.every_3_days, callback)
+		self.run_scheduler()
+		self.assertEqual(calls, [date(2012, 4, 7)])
+	
+	def testFailingCallbacksAreReported(self):
+		errors = []
+		self.scheduler = scheduler.Scheduler(clock=self.clock, sleep=self.clock.sleep, error_handler=errors.append)
+		def failing(occurrence, rc):
+			raise RuntimeError(occurrence)
+		def failing_future(occurrence, rc):
+			future = self.loop.create_future()
+			self.loop.call_soon(future.set_exception, KeyError(occurrence))
+			return future
+		self.scheduler.add(self.every_3_days, failing)
+		self.scheduler.add(self.every_3_days, failing_future)
+		self.scheduler.add(self.last_friday, self.callback(2))
+		self.run_scheduler()
+		self.assertEqual([occurrence for occurrence, _, _ in self.fired], [date(2012, 4, 27), date(2012, 5, 25)])
+		self.assertEqual(len(self.scheduler), 3)
+		sync_errors = [context['occurrence'] for context in errors if isinstance(context['exception'], RuntimeError)]
+		future_errors = [context['occurrence'] for context in errors if isinstance(context['exception'], KeyError)]
+		self.assertEqual(sync_errors[:3], [date(2012, 4, 7), date(2012, 4, 10), date(2012, 4, 13)])
+		self.assertEqual(future_errors[:3], [date(2012, 4, 7), date(2012, 4, 10), date(2012, 4, 13)])
+		self.assertTrue(all(context['schedule'].recurrence is self.every_3_days for context in errors))
+	
+	def testFailingCallbackDefaultsToLoopHandler(self):
+		contexts = []
+		self.loop.set_exception_handler(lambda loop, context: contexts.append(context))
+		def failing(occurrence, rc):
+			raise RuntimeError(occurrence)
+		self.scheduler.add(self.every_3_days, failing)
+		self.scheduler.add(self.last_friday, self.callback(1))
+		self.run_scheduler()
+		self.assertEqual(len(self.fired), 1)
+		self.assertEqual(contexts[0]['occurrence'], date(2012, 4, 7))
+		self.assertTrue(isinstance(contexts[0]['exception'], RuntimeError))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import io
+import struct
+from datetime import date
+from yearmonth import YearMonth
+import recurrence
+import serialization
+
+
+class TestSerialization(unittest.TestCase):
+	
+	def setUp(self):
+		self.recurrences = [
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=3),
+			recurrence.DaysBasedRecurrence(anchor=date(1, 1, 1), period=1),
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=3, ordinal=7),
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(2012, 4), period=1, ordinal=-1, day=recurrence.FRI),
+			recurrence.MonthsBasedRecurrence(anchor=YearMonth(9999, 12), period=12, ordinal=2, day=recurrence.SUN),
+			recurrence.DaysBasedRecurrence(anchor=date(2012, 4, 7), period=10),
+		]
+	
+	def testRoundTrip(self):
+		data = serialization.dumps(self.recurrences)
+		self.assertEqual(len(data), 12 + 16 * len(self.recurrences))
+		loaded = serialization.loads(data)
+		self.assertEqual(loaded, self.recurrences)
+		self.assertEqual([type(rc) for rc in loaded], [type(rc) for rc in self.recurrences])
+		self.assertIs(loaded[0].anchor, loaded[5].anchor)
+		self.assertEqual(loaded[3].get_occurrence(0), date(2012, 4, 27))
+		self.assertEqual(loaded[2].cache_info(), None)
+	
+	def testLoadedAttributesAreReadOnly(self):
+		loaded = serialization.loads(serialization.dumps(self.recurrences))
+		def set_period():
+			loaded[0].period = 10
+		self.assertRaises(AttributeError, set_period)
+		def set_day():
+			loaded[3].day = recurrence.MON
+		self.assertRaises(AttributeError, set_day)
+	
+	def testFile(self):
+		f = io.BytesIO()
+		serialization.dump(self.recurrences, f)
+		f.seek(0)
+		self.assertEqual(serialization.load(f), self.recurrences)
+	
+	def testEmpty(self):
+		self.assertEqual(serialization.loads(serialization.dumps([])), [])
+	
+	def testInvalidBuffers(self):
+		data = serialization.dumps(self.recurrences)
+		self.assertRaises(ValueError, serialization.loads, b'')
+		self.assertRaises(ValueError, serialization.loads, b'XXXX' + data[4:])
+		self.assertRaises(ValueError, serialization.loads, data[:4] + struct.pack('<H', 99) + data[6:])
+		self.assertRaises(ValueError, serialization.loads, data[:-1])
+		self.assertRaises(ValueError, serialization.loads, data[:12] + b'\x07' + data[13:])
+	
+	def testUnsupportedRecurrence(self):
+		self.assertRaises(ValueError, serialization.dumps, [object()])
+
+
+if __name__ == "__main__":
+	unittest.main()
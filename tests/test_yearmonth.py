@@ -1,6 +1,14 @@
 import unittest
+import calendar
+import pickle
 from yearmonth import YearMonth
 from datetime import date
+import yearmonth
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
 class TestYearMonth(unittest.TestCase):
@@ -8,7 +16,7 @@ class TestYearMonth(unittest.TestCase):
 
 	def setUp(self):
 		self.ym201112  = YearMonth(2011, 12)
-		self.ym201201  = YearMonth(2012, 01)
+		self.ym201201  = YearMonth(2012, 1)
 		self.ym201206a = YearMonth(2012,  6)
 		self.ym201206b = YearMonth(2012,  6)
 
@@ -65,6 +73,33 @@ class TestYearMonth(unittest.TestCase):
 		def from_invalid_string3():
 			YearMonth.from_string('xyz')
 		self.assertRaises(ValueError, from_invalid_string3)
+		
+		for string in ('2012-13', '2012-00', '2012/01', '+012-01', '2012-01\n', ' 2012-01'):
+			self.assertRaises(ValueError, lambda: YearMonth.from_string(string))
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testParseOrdinals(self):
+		strings = ['2011-12', '2012-01', '0001-01', '9999-12']
+		expected = [YearMonth.from_string(string).to_ordinal() for string in strings]
+		self.assertEqual(yearmonth.parse_ordinals(strings).tolist(), expected)
+		self.assertEqual(yearmonth.parse_ordinals(numpy.array(strings)).tolist(), expected)
+		self.assertEqual(yearmonth.parse_ordinals([s.encode('ascii') for s in strings]).tolist(), expected)
+		self.assertEqual(yearmonth.parse_ordinals([]).tolist(), [])
+		self.assertEqual(yearmonth.parse_year_months(strings), [YearMonth.from_string(string) for string in strings])
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testParseOrdinalsFromBuffer(self):
+		expected = [self.ym201112.to_ordinal(), self.ym201201.to_ordinal(), self.ym201206a.to_ordinal()]
+		self.assertEqual(yearmonth.parse_ordinals(b'2011-12\n2012-01\n2012-06').tolist(), expected)
+		self.assertEqual(yearmonth.parse_ordinals(bytearray(b'2011-12,2012-01,2012-06,')).tolist(), expected)
+		self.assertEqual(yearmonth.parse_ordinals(b'').tolist(), [])
+	
+	@unittest.skipIf(numpy is None, 'NumPy is not available')
+	def testParseOrdinalsInvalid(self):
+		for strings in (['2012-01', '2012-13'], ['2012-1'], ['2012-01-'], ['2012/01'], ['xyz']):
+			self.assertRaises(ValueError, lambda: yearmonth.parse_ordinals(strings))
+		for buffer in (b'2012-01\n2012-0', b'2012-01\n2012-01,2012-01', b'2012-01\n2012-00'):
+			self.assertRaises(ValueError, lambda: yearmonth.parse_ordinals(buffer))
 
 	def testToString(self):
 		self.assertEquals(str(self.ym201112) , '2011-12')
@@ -243,6 +278,54 @@ class TestYearMonth(unittest.TestCase):
 		assertSum(self.ym201206a, -6, self.ym201112)
 		assertSum(self.ym201206a, -5, self.ym201201)
 		assertSum(self.ym201206a,  0, self.ym201206a)
+	
+	def testAddAndSubtractOtherTypes(self):
+		for other in (self.ym201201, 1.0, '1', date(2012, 1, 1)):
+			self.assertRaises(TypeError, lambda: self.ym201112 + other)
+			self.assertRaises(TypeError, lambda: other + self.ym201112)
+		for other in (1.0, '1', date(2012, 1, 1)):
+			self.assertRaises(TypeError, lambda: self.ym201112 - other)
+		if numpy is not None:
+			self.assertEqual(self.ym201112 + numpy.int64(1), self.ym201201)
+			self.assertEqual(self.ym201201 - numpy.int32(1), self.ym201112)
+	
+	def testMonthInfo(self):
+		for year in (1, 1600, 1899, 1900, 2000, 2011, 2012, 2100, 9999):
+			for month in range(1, 13):
+				ym = YearMonth(year, month)
+				first_day = ym.get_first_day()
+				first_day_ordinal, length, weekday = yearmonth.month_info(ym.to_ordinal())
+				self.assertEqual(first_day_ordinal, first_day.toordinal())
+				self.assertEqual(length, calendar.monthrange(year, month)[1])
+				self.assertEqual(weekday, first_day.weekday())
+	
+	def testMonthInfoOutOfRange(self):
+		yearmonth.month_info(YearMonth(2012, 1).to_ordinal())
+		size = len(yearmonth._month_table[1])
+		for ordinal in (-1, 11, 120001, 10 ** 6, 10 ** 7):
+			self.assertRaises(ValueError, lambda: yearmonth.month_info(ordinal))
+		self.assertRaises(ValueError, lambda: yearmonth.month_ordinal_for_day(10 ** 9))
+		self.assertEqual(len(yearmonth._month_table[1]), size)
+		self.assertEqual(yearmonth.month_info(YearMonth(10000, 1).to_ordinal())[0], date.max.toordinal() + 1)
+	
+	def testMonthOrdinalForDay(self):
+		for year in (1, 1600, 1899, 1900, 2000, 2011, 2012, 2100, 9999):
+			for month in range(1, 13):
+				ym = YearMonth(year, month)
+				first_day = ym.get_first_day().toordinal()
+				last_day = ym.get_last_day().toordinal()
+				for day_ordinal in (first_day, first_day + 14, last_day):
+					self.assertEqual(yearmonth.month_ordinal_for_day(day_ordinal), ym.to_ordinal())
+	
+	def testPickle(self):
+		for ym in (self.ym201112, self.ym201201, self.ym201206a):
+			self.assertEqual(pickle.loads(pickle.dumps(ym)), ym)
+	
+	def testComparisonWithDates(self):
+		self.assertTrue( self.ym201112 == date(2011, 12, 15))
+		self.assertFalse(self.ym201112 != date(2011, 12, 15))
+		self.assertFalse(self.ym201112 == date(2012, 12, 1))
+		self.assertTrue( self.ym201112 != date(2011, 11, 1))
 
 		
 
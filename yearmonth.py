@@ -1,83 +1,256 @@
-from datetime import date, timedelta
-from functools import total_ordering
-import re
+from datetime import date
+import numbers
+import threading
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
-@total_ordering
 class YearMonth(object):
+	# Instances only hold the month ordinal (year * 12 + month - 1); '__dict__'
+	# is kept so that ad-hoc attributes can still be attached
+	__slots__ = ('_ordinal', '__dict__')
+	
 	def __init__(self, year, month):
 		if month < 1 or month > 12:
 			raise ValueError('Invalid month: ' + str(month))
 		
-		self.year = year
-		self.month = month
+		self._ordinal = year * 12 + (month - 1)
+	
+	@property
+	def year(self):
+		return self._ordinal // 12
+	
+	@property
+	def month(self):
+		return self._ordinal % 12 + 1
 	
 	@staticmethod
 	def from_string(string):
-		m = re.match(r'^(\d{4})-(\d{2})$', string)
-		if m is None:
+		# 'YYYY-MM'; see parse_ordinals() for many strings at once
+		if len(string) != 7 or string[4] != '-' or not (string[:4].isdigit() and string[5:].isdigit()):
 			raise ValueError('Invalid YearMonth string initialization: ' + repr(string))
-		else:
-			year  = int(m.group(1))
-			month = int(m.group(2))
-			return YearMonth(year, month)
+		month = int(string[5:])
+		if month < 1 or month > 12:
+			raise ValueError('Invalid month: ' + str(month))
+		ym = _new(YearMonth)
+		ym._ordinal = int(string[:4]) * 12 + (month - 1)
+		return ym
 	
 	@staticmethod
 	def from_date(date):
-		return YearMonth(date.year, date.month)
+		ym = _new(YearMonth)
+		ym._ordinal = date.year * 12 + (date.month - 1)
+		return ym
 	
 	@staticmethod
 	def from_ordinal(ordinal):
-		year = ordinal // 12
-		month = (ordinal % 12) + 1
-		return YearMonth(year, month)
-	
-	def __setattr__(self, attr, value):
-		if attr in ('year', 'month') and hasattr(self, attr):
-			raise AttributeError('Attribute ' + attr + ' cannot be set')
-		return super(YearMonth, self).__setattr__(attr, value)
+		ym = _new(YearMonth)
+		ym._ordinal = ordinal
+		return ym
 	
 	def to_ordinal(self):
-		return self.year * 12 + (self.month - 1)
+		return self._ordinal
 	
 	def get_first_day(self):
 		return self.get_date(1)
 	
 	def get_last_day(self):
-		return (self + 1).get_first_day() - timedelta(days=1)
+		first_day, length, _ = month_info(self._ordinal)
+		return date.fromordinal(first_day + length - 1)
 	
 	def get_date(self, day):
 		return date(self.year, self.month, day)
 	
 	def __hash__(self):
-		return self.to_ordinal()
+		return self._ordinal
 	
 	def __eq__(self, other):
+		if isinstance(other, YearMonth):
+			return self._ordinal == other._ordinal
 		return self.year == other.year and self.month == other.month
 	
 	def __ne__(self, other):
+		if isinstance(other, YearMonth):
+			return self._ordinal != other._ordinal
 		return self.year != other.year or self.month != other.month
 	
 	def __lt__(self, other):
-		return self.to_ordinal() < other.to_ordinal()
+		if not isinstance(other, YearMonth):
+			return NotImplemented
+		return self._ordinal < other._ordinal
+	
+	def __le__(self, other):
+		if not isinstance(other, YearMonth):
+			return NotImplemented
+		return self._ordinal <= other._ordinal
+	
+	def __gt__(self, other):
+		if not isinstance(other, YearMonth):
+			return NotImplemented
+		return self._ordinal > other._ordinal
+	
+	def __ge__(self, other):
+		if not isinstance(other, YearMonth):
+			return NotImplemented
+		return self._ordinal >= other._ordinal
+	
+	# int is tested before numbers.Integral, whose check is much slower
 	
 	def __add__(self, other):
-		return YearMonth.from_ordinal(self.to_ordinal() + other)
+		if not isinstance(other, int) and not isinstance(other, numbers.Integral):
+			return NotImplemented
+		ym = _new(YearMonth)
+		ym._ordinal = self._ordinal + other
+		return ym
 	
 	def __radd__(self, other):
-		return self + other
+		return self.__add__(other)
 	
 	def __sub__(self, other):
 		if isinstance(other, YearMonth):
-			return self.to_ordinal() - other.to_ordinal()
-		else:
-			return self + (-other)
+			return self._ordinal - other._ordinal
+		if not isinstance(other, int) and not isinstance(other, numbers.Integral):
+			return NotImplemented
+		ym = _new(YearMonth)
+		ym._ordinal = self._ordinal - other
+		return ym
+	
+	def __reduce__(self):
+		return (YearMonth, (self.year, self.month))
 	
 	def __str__(self):
 		return '%04d-%02d' % (self.year, self.month)
 
-	def __unicode__(self):
-		return unicode(str(self))
-
 	def __repr__(self):
 		return '%s(%d,%d)' % (self.__class__.__name__, self.year, self.month)
+
+
+_new = object.__new__
+
+
+# Bulk parsing of 'YYYY-MM' strings, as exported in CSV files. The strings
+# are laid out as fixed-width byte records and converted digit by digit with
+# NumPy, without creating an object per string.
+
+_DASH = ord('-')
+_ZERO = ord('0')
+
+
+def parse_ordinals(strings):
+	# Month ordinals, as an int64 array, of a list or array of 'YYYY-MM'
+	# strings, or of a bytes buffer holding such strings separated by a
+	# single byte each (e.g. b'2012-01\n2012-02\n')
+	if numpy is None:
+		raise ImportError('NumPy is required for bulk parsing')
+	
+	if isinstance(strings, (bytes, bytearray, memoryview)):
+		buffer = numpy.frombuffer(strings, dtype=numpy.uint8)
+		if len(buffer) % 8 not in (0, 7):
+			raise ValueError('Invalid YearMonth buffer length: %d' % len(buffer))
+		records = numpy.zeros(((len(buffer) + 1) // 8, 8), dtype=numpy.uint8)
+		records.flat[:len(buffer)] = buffer
+		separators = records[:-1, 7]
+		if len(separators) and (separators != separators[0]).any():
+			raise ValueError('YearMonth buffer records must be separated by a single repeated byte')
+		records[:, 7] = 0
+	else:
+		# One byte more than needed, so that longer strings are caught
+		records = numpy.asarray(strings, dtype='S8').reshape(-1).view(numpy.uint8).reshape(-1, 8)
+	
+	digits = records[:, [0, 1, 2, 3, 5, 6]].astype(numpy.int64) - _ZERO
+	year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+	month = digits[:, 4] * 10 + digits[:, 5]
+	valid = (((digits >= 0) & (digits <= 9)).all(axis=1) & (records[:, 4] == _DASH) & (records[:, 7] == 0)
+			& (month >= 1) & (month <= 12))
+	if not valid.all():
+		index = int(numpy.argmin(valid))
+		raise ValueError('Invalid YearMonth string at index %d: %r' % (index, records[index].tobytes().rstrip(b'\0')))
+	return year * 12 + (month - 1)
+
+
+def parse_year_months(strings):
+	# As parse_ordinals(), but returns a list of YearMonth instances
+	return [YearMonth.from_ordinal(ordinal) for ordinal in parse_ordinals(strings).tolist()]
+
+
+# Calendar facts per month ordinal: (proleptic ordinal of the first day,
+# number of days, weekday of the first day). The table is shared and grows a
+# century at a time around the ordinals actually looked up.
+
+_MONTH_LENGTHS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_TABLE_CHUNK = 1200
+
+# The months datetime.date supports, plus January 10000, the ceiling of the
+# last of them
+_MIN_ORDINAL = YearMonth(1, 1).to_ordinal()
+_MAX_ORDINAL = YearMonth(10000, 1).to_ordinal()
+
+_month_table = (0, [])
+_month_table_lock = threading.Lock()
+
+
+def month_info(ordinal):
+	start, entries = _month_table
+	index = ordinal - start
+	if index < 0 or index >= len(entries):
+		start, entries = _extend_month_table(ordinal)
+		index = ordinal - start
+	return entries[index]
+
+
+def month_ordinal_for_day(day_ordinal):
+	# Month ordinal of the month holding a proleptic day ordinal: an estimate
+	# from the mean month length of the 400-year cycle, corrected by at most
+	# a month against the table
+	ordinal = 12 + (day_ordinal - 1) * 4800 // 146097
+	while month_info(ordinal)[0] > day_ordinal:
+		ordinal -= 1
+	while month_info(ordinal + 1)[0] <= day_ordinal:
+		ordinal += 1
+	return ordinal
+
+
+def _extend_month_table(ordinal):
+	global _month_table
+	if not _MIN_ORDINAL <= ordinal <= _MAX_ORDINAL:
+		raise ValueError('Month ordinal out of range: ' + repr(ordinal))
+	with _month_table_lock:
+		start, entries = _month_table
+		if entries:
+			stop = start + len(entries)
+		else:
+			start = stop = max(ordinal - ordinal % _TABLE_CHUNK, _MIN_ORDINAL)
+		# Kept within the supported months, so that lookups outside them never
+		# hit the table and always get here
+		new_start = max(min(start, ordinal - ordinal % _TABLE_CHUNK), _MIN_ORDINAL)
+		new_stop = min(max(stop, ordinal - ordinal % _TABLE_CHUNK + _TABLE_CHUNK), _MAX_ORDINAL + 1)
+		entries = _build_month_entries(new_start, start) + entries + _build_month_entries(stop, new_stop)
+		_month_table = (new_start, entries)
+		return _month_table
+
+
+def _build_month_entries(start, stop):
+	entries = []
+	if start >= stop:
+		return entries
+	year = start // 12
+	y = year - 1
+	first_day = y * 365 + y // 4 - y // 100 + y // 400 + 1
+	for month in range(start % 12):
+		first_day += _month_length(year, month)
+	for ordinal in range(start, stop):
+		year, month = divmod(ordinal, 12)
+		length = _month_length(year, month)
+		entries.append((first_day, length, (first_day + 6) % 7))
+		first_day += length
+	return entries
+
+
+def _month_length(year, month):
+	# month is zero-based here, as in the month ordinal
+	if month == 1 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+		return 29
+	return _MONTH_LENGTHS[month]